@@ -0,0 +1,119 @@
+"""Store money columns as integer cents
+
+Converts the NUMERIC(10, 2) money columns of employees and payroll_records
+to BIGINT cents (value * 100), the storage used by ``MoneyCents``. Columns
+that are already integers are skipped, so the revision is a no-op on
+databases created from the current models.
+
+Revision ID: 3f2a9c1d7b10
+Revises: 
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Dict, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7b10'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Money column -> whether the model gives it a server-side default of 0
+MONEY_COLUMNS: Dict[str, Tuple[Tuple[str, bool], ...]] = {
+    "employees": (
+        ("salary", False),
+        ("hourly_rate", False),
+        ("additional_federal_withholding", True),
+        ("additional_state_withholding", True),
+    ),
+    "payroll_records": (
+        ("gross_pay", False),
+        ("net_pay", False),
+        ("federal_income_tax", True),
+        ("state_income_tax", True),
+        ("social_security_tax", True),
+        ("medicare_tax", True),
+        ("health_insurance", True),
+        ("dental_insurance", True),
+        ("vision_insurance", True),
+        ("life_insurance", True),
+        ("disability_insurance", True),
+        ("retirement_401k", True),
+        ("other_deductions", True),
+        ("total_deductions", False),
+        ("direct_deposit_amount", False),
+    ),
+}
+
+LEGACY_TYPE = sa.Numeric(10, 2)
+
+
+def _money_columns(table: str, stored_as_integer: bool) -> Tuple[Tuple[str, bool], ...]:
+    """Money columns of ``table`` currently stored as integers (or not)."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return ()
+    
+    types = {column["name"]: column["type"] for column in inspector.get_columns(table)}
+    return tuple(
+        (name, has_default) for name, has_default in MONEY_COLUMNS[table]
+        if name in types and isinstance(types[name], sa.Integer) == stored_as_integer
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+    
+    for table in MONEY_COLUMNS:
+        columns = _money_columns(table, stored_as_integer=False)
+        if not columns:
+            continue
+        
+        if not is_postgresql:
+            # SQLite cannot ALTER ... USING; scale the values in place, then
+            # let batch mode rebuild the table with the new column types
+            op.execute(
+                f"UPDATE {table} SET "
+                + ", ".join(f"{name} = CAST(ROUND({name} * 100) AS INTEGER)" for name, _ in columns)
+            )
+        
+        with op.batch_alter_table(table) as batch:
+            for name, has_default in columns:
+                batch.alter_column(
+                    name,
+                    existing_type=LEGACY_TYPE,
+                    type_=sa.BigInteger(),
+                    server_default=sa.text('0') if has_default else None,
+                    postgresql_using=f"ROUND({name} * 100)::bigint",
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+    
+    for table in MONEY_COLUMNS:
+        columns = _money_columns(table, stored_as_integer=True)
+        if not columns:
+            continue
+        
+        with op.batch_alter_table(table) as batch:
+            for name, _ in columns:
+                batch.alter_column(
+                    name,
+                    existing_type=sa.BigInteger(),
+                    type_=LEGACY_TYPE,
+                    server_default=None,
+                    postgresql_using=f"({name} / 100.0)::numeric(10, 2)",
+                )
+        
+        if not is_postgresql:
+            op.execute(
+                f"UPDATE {table} SET "
+                + ", ".join(f"{name} = {name} / 100.0" for name, _ in columns)
+            )
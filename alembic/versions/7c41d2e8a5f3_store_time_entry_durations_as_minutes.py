@@ -0,0 +1,85 @@
+"""Store time entry durations as whole minutes
+
+Replaces the NUMERIC(8, 2) hour columns of time_entries with SMALLINT
+minute columns (hours * 60), the storage behind ``TimeEntry``'s hour
+views. Skipped when the minute columns already exist.
+
+Revision ID: 7c41d2e8a5f3
+Revises: 3f2a9c1d7b10
+Create Date: 2026-10-16 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c41d2e8a5f3'
+down_revision: Union[str, Sequence[str], None] = '3f2a9c1d7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Legacy hour column -> minute column
+DURATION_COLUMNS = (
+    ("total_hours", "total_minutes"),
+    ("regular_hours", "regular_minutes"),
+    ("overtime_hours", "overtime_minutes"),
+    ("double_time_hours", "double_time_minutes"),
+    ("break_duration", "break_minutes"),
+    ("lunch_duration", "lunch_minutes"),
+)
+
+
+def _stored_columns() -> set:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("time_entries"):
+        return set()
+    return {column["name"] for column in inspector.get_columns("time_entries")}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    stored = _stored_columns()
+    if "total_hours" not in stored or "total_minutes" in stored:
+        return
+    
+    with op.batch_alter_table("time_entries") as batch:
+        for _, minutes in DURATION_COLUMNS:
+            batch.add_column(sa.Column(minutes, sa.SmallInteger(), nullable=True))
+    
+    op.execute(
+        "UPDATE time_entries SET "
+        + ", ".join(
+            f"{minutes} = CAST(ROUND({hours} * 60) AS SMALLINT)"
+            for hours, minutes in DURATION_COLUMNS
+        )
+    )
+    
+    with op.batch_alter_table("time_entries") as batch:
+        for hours, _ in DURATION_COLUMNS:
+            batch.drop_column(hours)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    stored = _stored_columns()
+    if "total_minutes" not in stored or "total_hours" in stored:
+        return
+    
+    with op.batch_alter_table("time_entries") as batch:
+        for hours, _ in DURATION_COLUMNS:
+            batch.add_column(sa.Column(hours, sa.Numeric(8, 2), nullable=True))
+    
+    op.execute(
+        "UPDATE time_entries SET "
+        + ", ".join(
+            f"{hours} = ROUND({minutes} / 60.0, 2)"
+            for hours, minutes in DURATION_COLUMNS
+        )
+    )
+    
+    with op.batch_alter_table("time_entries") as batch:
+        for _, minutes in DURATION_COLUMNS:
+            batch.drop_column(minutes)
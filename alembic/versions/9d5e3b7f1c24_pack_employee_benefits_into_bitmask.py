@@ -0,0 +1,86 @@
+"""Pack employee benefit enrollments into a bitmask
+
+Replaces the six boolean enrollment columns of employees with the
+SMALLINT ``benefits_mask`` behind ``Employee``'s benefit views, one
+``BenefitFlag`` bit per former column. Skipped when the mask already
+exists.
+
+Revision ID: 9d5e3b7f1c24
+Revises: 7c41d2e8a5f3
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d5e3b7f1c24'
+down_revision: Union[str, Sequence[str], None] = '7c41d2e8a5f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Legacy boolean column -> BenefitFlag bit
+BENEFIT_COLUMNS = (
+    ("health_insurance", 1),
+    ("dental_insurance", 2),
+    ("vision_insurance", 4),
+    ("life_insurance", 8),
+    ("disability_insurance", 16),
+    ("retirement_401k", 32),
+)
+
+
+def _stored_columns() -> set:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("employees"):
+        return set()
+    return {column["name"] for column in inspector.get_columns("employees")}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    stored = _stored_columns()
+    if "health_insurance" not in stored or "benefits_mask" in stored:
+        return
+    
+    with op.batch_alter_table("employees") as batch:
+        batch.add_column(sa.Column(
+            "benefits_mask", sa.SmallInteger(), server_default="0", nullable=False
+        ))
+    
+    op.execute(
+        "UPDATE employees SET benefits_mask = "
+        + " + ".join(
+            f"CASE WHEN {column} THEN {bit} ELSE 0 END"
+            for column, bit in BENEFIT_COLUMNS
+        )
+    )
+    
+    with op.batch_alter_table("employees") as batch:
+        for column, _ in BENEFIT_COLUMNS:
+            batch.drop_column(column)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    stored = _stored_columns()
+    if "benefits_mask" not in stored or "health_insurance" in stored:
+        return
+    
+    with op.batch_alter_table("employees") as batch:
+        for column, _ in BENEFIT_COLUMNS:
+            batch.add_column(sa.Column(column, sa.Boolean(), nullable=True))
+    
+    op.execute(
+        "UPDATE employees SET "
+        + ", ".join(
+            f"{column} = (benefits_mask & {bit}) != 0"
+            for column, bit in BENEFIT_COLUMNS
+        )
+    )
+    
+    with op.batch_alter_table("employees") as batch:
+        batch.drop_column("benefits_mask")
@@ -0,0 +1,65 @@
+"""Add generated tax and benefit totals to payroll records
+
+Adds the stored ``tax_deductions_total`` and ``benefit_deductions_total``
+columns that ``PayrollRecord`` declares as ``Computed``. Existing rows are
+filled in by the database. Skipped when the columns already exist.
+
+Revision ID: e2b8c6a4f019
+Revises: 9d5e3b7f1c24
+Create Date: 2026-10-16 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8c6a4f019'
+down_revision: Union[str, Sequence[str], None] = '9d5e3b7f1c24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Generated column -> expression over the integer-cents money columns
+TOTAL_COLUMNS = (
+    (
+        "tax_deductions_total",
+        "federal_income_tax + state_income_tax + social_security_tax + medicare_tax",
+    ),
+    (
+        "benefit_deductions_total",
+        "health_insurance + dental_insurance + vision_insurance + life_insurance"
+        " + disability_insurance + retirement_401k",
+    ),
+)
+
+
+def _stored_columns() -> set:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("payroll_records"):
+        return set()
+    return {column["name"] for column in inspector.get_columns("payroll_records")}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    stored = _stored_columns()
+    if not stored or "tax_deductions_total" in stored:
+        return
+    
+    with op.batch_alter_table("payroll_records") as batch:
+        for column, expression in TOTAL_COLUMNS:
+            batch.add_column(sa.Column(
+                column, sa.BigInteger(), sa.Computed(expression, persisted=True)
+            ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if "tax_deductions_total" not in _stored_columns():
+        return
+    
+    with op.batch_alter_table("payroll_records") as batch:
+        for column, _ in TOTAL_COLUMNS:
+            batch.drop_column(column)
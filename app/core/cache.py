@@ -5,7 +5,9 @@ This module provides Redis-compatible caching functionality using an in-memory c
 with TTL support. Can be easily switched to Redis for production use.
 """
 
+import asyncio
 import json
+import sys
 import time
 import threading
 from typing import Any, Optional, Dict, Union
@@ -15,8 +17,11 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class CacheItem:
     """Represents a cached item with expiration."""
     value: Any
@@ -308,27 +313,63 @@ def cached(ttl: int = 300, key_prefix: str = ""):
 
 
 # Background cleanup task
-def start_cleanup_task(interval: int = 300):
+_cleanup_task: Optional[asyncio.Task] = None
+_cleanup_stop: Optional[asyncio.Event] = None
+
+
+async def _cleanup_loop(interval: int, stop_event: asyncio.Event) -> None:
+    """Evict expired entries every ``interval`` seconds until ``stop_event`` is set."""
+    while True:
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+            return
+        except asyncio.TimeoutError:
+            pass
+        
+        try:
+            removed = _cache.cleanup_expired()
+            if removed > 0:
+                logger.info(f"Cleaned up {removed} expired cache entries")
+        except Exception as e:
+            logger.error(f"Error in cache cleanup task: {e}")
+
+
+def start_cleanup_task(interval: int = 300) -> asyncio.Task:
     """
     Start a background task to clean up expired cache entries.
     
+    Must be called from within a running event loop (e.g. the application
+    lifespan); pair with ``stop_cleanup_task`` on shutdown.
+    
     Args:
         interval: Cleanup interval in seconds
+        
+    Returns:
+        The running cleanup task
     """
-    def cleanup_worker():
-        while True:
-            try:
-                removed = _cache.cleanup_expired()
-                if removed > 0:
-                    logger.info(f"Cleaned up {removed} expired cache entries")
-                time.sleep(interval)
-            except Exception as e:
-                logger.error(f"Error in cache cleanup task: {e}")
-                time.sleep(interval)
-    
-    cleanup_thread = threading.Thread(target=cleanup_worker, daemon=True)
-    cleanup_thread.start()
+    global _cleanup_task, _cleanup_stop
+    
+    if _cleanup_task is not None and not _cleanup_task.done():
+        return _cleanup_task
+    
+    _cleanup_stop = asyncio.Event()
+    _cleanup_task = asyncio.create_task(_cleanup_loop(interval, _cleanup_stop))
     logger.info(f"Started cache cleanup task with {interval}s interval")
+    return _cleanup_task
+
+
+async def stop_cleanup_task() -> None:
+    """Signal the cleanup task to exit and wait for it to finish."""
+    global _cleanup_task, _cleanup_stop
+    
+    if _cleanup_task is None:
+        return
+    
+    _cleanup_stop.set()
+    await _cleanup_task
+    _cleanup_task = None
+    _cleanup_stop = None
+    logger.info("Stopped cache cleanup task")
 
 
 # Cache utility functions for common operations
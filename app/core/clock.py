@@ -0,0 +1,102 @@
+"""
+Coarse clock for hot paths.
+
+This module keeps a cached wall-clock and monotonic timestamp refreshed by a
+background task, so per-request code that only needs sub-second resolution
+(rate-limit windows, reset headers, response timestamps) can read a module
+global instead of calling into the clock on every request.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Cached timestamps, refreshed every ``interval`` seconds by the clock task
+_now: float = time.time()
+_monotonic: float = time.monotonic()
+
+_clock_task: Optional[asyncio.Task] = None
+_clock_stop: Optional[asyncio.Event] = None
+
+
+def coarse_time() -> float:
+    """
+    Get the cached wall-clock time.
+    
+    Falls back to ``time.time()`` when the clock task is not running.
+    
+    Returns:
+        Seconds since the epoch
+    """
+    return _now if _clock_task is not None else time.time()
+
+
+def coarse_monotonic() -> float:
+    """
+    Get the cached monotonic time.
+    
+    Falls back to ``time.monotonic()`` when the clock task is not running.
+    
+    Returns:
+        Monotonic seconds
+    """
+    return _monotonic if _clock_task is not None else time.monotonic()
+
+
+def _tick() -> None:
+    """Refresh the cached timestamps."""
+    global _now, _monotonic
+    _now = time.time()
+    _monotonic = time.monotonic()
+
+
+async def _clock_loop(interval: float, stop_event: asyncio.Event) -> None:
+    """Refresh the cached timestamps every ``interval`` seconds until ``stop_event`` is set."""
+    while True:
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+            return
+        except asyncio.TimeoutError:
+            _tick()
+
+
+def start_clock_task(interval: float = 0.2) -> asyncio.Task:
+    """
+    Start a background task that refreshes the coarse clock.
+    
+    Must be called from within a running event loop (e.g. the application
+    lifespan); pair with ``stop_clock_task`` on shutdown.
+    
+    Args:
+        interval: Refresh interval in seconds
+    
+    Returns:
+        The running clock task
+    """
+    global _clock_task, _clock_stop
+    
+    if _clock_task is not None and not _clock_task.done():
+        return _clock_task
+    
+    _tick()
+    _clock_stop = asyncio.Event()
+    _clock_task = asyncio.create_task(_clock_loop(interval, _clock_stop))
+    logger.info(f"Started coarse clock task with {interval}s interval")
+    return _clock_task
+
+
+async def stop_clock_task() -> None:
+    """Signal the clock task to exit and wait for it to finish."""
+    global _clock_task, _clock_stop
+    
+    if _clock_task is None:
+        return
+    
+    _clock_stop.set()
+    await _clock_task
+    _clock_task = None
+    _clock_stop = None
+    logger.info("Stopped coarse clock task")
@@ -30,6 +30,7 @@ class Settings(BaseSettings):
     # API Configuration
     API_V1_STR: str = Field(default="/api/v1")
     ALLOWED_HOSTS: List[str] = Field(default=["*"])
+    FAST_HEALTH_CHECK: bool = Field(default=True)
 
     # Database Configuration
     DATABASE_URL: str = Field(
@@ -38,12 +39,18 @@ class Settings(BaseSettings):
     DATABASE_TEST_URL: str = Field(
         default="sqlite:///./payroll_test.db"
     )
+    DB_POOL_SIZE: int = Field(default=20, ge=1)
+    DB_MAX_OVERFLOW: int = Field(default=10, ge=0)
+    DB_POOL_TIMEOUT: int = Field(default=30, ge=1)
+    DB_POOL_RECYCLE: int = Field(default=1800)
 
     # Security Configuration
     SECRET_KEY: str = Field(
         default="your-super-secret-key-here-change-this-in-production"
     )
     ALGORITHM: str = Field(default="HS256")
+    # Fernet key for encrypted columns; required, checked at startup
+    FIELD_ENCRYPTION_KEY: Optional[str] = Field(default=None)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30)
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=7)
 
@@ -53,6 +60,7 @@ class Settings(BaseSettings):
     PASSWORD_REQUIRE_LOWERCASE: bool = Field(default=True)
     PASSWORD_REQUIRE_NUMBERS: bool = Field(default=True)
     PASSWORD_REQUIRE_SYMBOLS: bool = Field(default=True)
+    BCRYPT_ROUNDS: int = Field(default=12, ge=4, le=31)
 
     # CORS Configuration
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = Field(default=[])
@@ -139,4 +147,8 @@ class Settings(BaseSettings):
 @lru_cache()
 def get_settings() -> Settings:
     """Get cached settings instance."""
-    return Settings() 
\ No newline at end of file
+    return Settings()
+
+
+# Process-wide settings instance; import this rather than calling get_settings()
+settings: Settings = get_settings()
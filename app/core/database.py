@@ -6,16 +6,17 @@ and initialization functions for the payroll management system.
 """
 
 import logging
+import os
+import sqlite3
 from typing import AsyncGenerator
-from sqlalchemy import create_engine, event, pool
+from sqlalchemy import Integer, Numeric, create_engine, event, inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
-from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
 
-from app.core.config import get_settings
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
 
 # Create the base class for declarative models
 Base = declarative_base()
@@ -27,55 +28,62 @@ if DATABASE_URL.startswith("sqlite://"):
 else:
     ASYNC_DATABASE_URL = DATABASE_URL
 
-# Connection pool configuration
+# Connection pool configuration, sized to request concurrency (see settings)
 POOL_CONFIG = {
-    "pool_size": 10,           # Number of permanent connections to maintain
-    "max_overflow": 20,        # Maximum number of connections to create beyond pool_size
-    "pool_timeout": 30,        # Timeout for getting connection from pool
-    "pool_recycle": 3600,      # Recycle connections after 1 hour
-    "pool_pre_ping": True,     # Validate connections before use
+    "pool_size": settings.DB_POOL_SIZE,          # Number of permanent connections to maintain
+    "max_overflow": settings.DB_MAX_OVERFLOW,    # Maximum number of connections to create beyond pool_size
+    "pool_timeout": settings.DB_POOL_TIMEOUT,    # Timeout for getting connection from pool
+    "pool_recycle": settings.DB_POOL_RECYCLE,    # Recycle connections after 30 minutes by default
+    "pool_pre_ping": True,                       # Validate connections before use
 }
 
-# For SQLite, we need to use StaticPool for in-memory databases
-# and NullPool for file-based databases (async compatibility)
-if "memory" in DATABASE_URL:
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+# In-memory SQLite must share a single connection (StaticPool); file-based
+# databases keep a reusable pool so connections and their page cache stay warm
+if IS_SQLITE and "memory" in DATABASE_URL:
     sqlite_pool_class = StaticPool
     async_pool_class = StaticPool
+    pool_kwargs = {}
 else:
     sqlite_pool_class = QueuePool
-    async_pool_class = pool.NullPool  # Use NullPool for async SQLite
+    async_pool_class = AsyncAdaptedQueuePool
+    pool_kwargs = dict(POOL_CONFIG)
+
+# SQLite-specific driver arguments; other backends keep the driver defaults
+if IS_SQLITE:
+    sync_connect_args = {
+        "check_same_thread": False,
+        "timeout": 20,
+        # Performance optimizations
+        "isolation_level": None,  # Use autocommit mode
+    }
+    async_connect_args = {
+        "check_same_thread": False,
+        "timeout": 20,
+    }
+else:
+    sync_connect_args = {}
+    async_connect_args = {}
 
 # Create sync engine with optimized settings
 sync_engine = create_engine(
     DATABASE_URL,
     poolclass=sqlite_pool_class,
-    pool_size=POOL_CONFIG["pool_size"],
-    max_overflow=POOL_CONFIG["max_overflow"],
-    pool_timeout=POOL_CONFIG["pool_timeout"],
-    pool_recycle=POOL_CONFIG["pool_recycle"],
-    pool_pre_ping=POOL_CONFIG["pool_pre_ping"],
+    **pool_kwargs,
     echo=settings.DEBUG,
     future=True,
-    # SQLite-specific optimizations
-    connect_args={
-        "check_same_thread": False,
-        "timeout": 20,
-        # Performance optimizations
-        "isolation_level": None,  # Use autocommit mode
-    },
+    connect_args=sync_connect_args,
 )
 
 # Create async engine with optimized settings
 async_engine = create_async_engine(
     ASYNC_DATABASE_URL,
     poolclass=async_pool_class,
+    **pool_kwargs,
     echo=settings.DEBUG,
     future=True,
-    # SQLite-specific optimizations
-    connect_args={
-        "check_same_thread": False,
-        "timeout": 20,
-    },
+    connect_args=async_connect_args,
 )
 
 # Create session factories
@@ -95,39 +103,88 @@ async_session_factory = async_sessionmaker(
     expire_on_commit=False  # Keep objects accessible after commit
 )
 
+# Read-only sessions skip the implicit flush before every query
+readonly_async_session_factory = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    autocommit=False,
+    expire_on_commit=False
+)
+
+
+# SQLite file-layout PRAGMAs. They only take effect on a new database file,
+# before WAL is enabled and the first table exists, so they are applied once
+# by init_db rather than on every connection
+SQLITE_INIT_PRAGMAS = (
+    "page_size=4096",              # Optimal page size
+    "auto_vacuum=INCREMENTAL",
+    "journal_mode=WAL",            # Writes the header, persisting the two above
+)
+SQLITE_INIT_SCRIPT = "".join(f"PRAGMA {pragma};" for pragma in SQLITE_INIT_PRAGMAS)
+
+# SQLite connection PRAGMAs, applied to every new pooled connection
+SQLITE_PRAGMAS = (
+    # Performance optimizations
+    "journal_mode=WAL",            # Write-Ahead Logging
+    "synchronous=NORMAL",          # Balanced durability/performance
+    "wal_autocheckpoint=2000",     # Checkpoint every 2000 pages
+    "journal_size_limit=67108864", # Cap WAL file at 64MB
+    "cache_size=-65536",           # 64MB page cache (negative = KiB)
+    "temp_store=MEMORY",           # Store temp tables in memory
+    "mmap_size=268435456",         # 256MB memory-mapped I/O
+    "busy_timeout=5000",           # 5-second busy timeout; callers retry on 503
+    # Enable foreign key constraints
+    "foreign_keys=ON",
+)
+SQLITE_PRAGMA_SCRIPT = "".join(f"PRAGMA {pragma};" for pragma in SQLITE_PRAGMAS)
+
 
 # SQLite optimization event listeners
-@event.listens_for(sync_engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
     """Set SQLite pragmas for performance optimization."""
-    cursor = dbapi_connection.cursor()
-    
-    # Performance optimizations
-    cursor.execute("PRAGMA journal_mode=WAL")          # Write-Ahead Logging
-    cursor.execute("PRAGMA synchronous=NORMAL")        # Balanced durability/performance
-    cursor.execute("PRAGMA cache_size=10000")          # Increase cache size
-    cursor.execute("PRAGMA temp_store=MEMORY")         # Store temp tables in memory
-    cursor.execute("PRAGMA mmap_size=268435456")       # 256MB memory-mapped I/O
-    cursor.execute("PRAGMA page_size=4096")            # Optimal page size
-    cursor.execute("PRAGMA busy_timeout=30000")        # 30-second busy timeout
-    
-    # Enable foreign key constraints
-    cursor.execute("PRAGMA foreign_keys=ON")
-    
-    # Query optimization
-    cursor.execute("PRAGMA optimize")
-    
-    cursor.close()
+    executescript = getattr(dbapi_connection, "executescript", None)
+    if executescript is not None:
+        # One call into SQLite for the whole batch
+        executescript(SQLITE_PRAGMA_SCRIPT)
+    else:
+        # The aiosqlite adapter only exposes cursor-level execute()
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
     
     logger.info("SQLite pragmas set for performance optimization")
 
 
-@event.listens_for(async_engine.sync_engine, "connect")
 def set_sqlite_pragma_async(dbapi_connection, connection_record):
     """Set SQLite pragmas for async engine."""
     set_sqlite_pragma(dbapi_connection, connection_record)
 
 
+def optimize_sqlite_on_close(dbapi_connection, connection_record):
+    """Run PRAGMA optimize so the stats gathered by this connection are kept."""
+    try:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA optimize")
+        cursor.close()
+    except Exception as e:
+        logger.debug(f"Skipping PRAGMA optimize on close: {e}")
+
+
+def optimize_sqlite_on_close_async(dbapi_connection, connection_record):
+    """Run PRAGMA optimize before an async engine connection is closed."""
+    optimize_sqlite_on_close(dbapi_connection, connection_record)
+
+
+# PRAGMAs are SQLite-only; other servers would reject them on every connect
+if IS_SQLITE:
+    event.listen(sync_engine, "connect", set_sqlite_pragma)
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragma_async)
+    event.listen(sync_engine, "close", optimize_sqlite_on_close)
+    event.listen(async_engine.sync_engine, "close", optimize_sqlite_on_close_async)
+
+
 # Database session dependencies
 def get_db() -> Session:
     """
@@ -165,18 +222,107 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
             await db.close()
 
 
+async def get_async_db_ro() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get read-only async database session for dependency injection.
+    
+    Autoflush is disabled, so endpoints that write must use get_async_db
+    or flush explicitly.
+    
+    Yields:
+        AsyncSession: Async database session without autoflush
+    """
+    async with readonly_async_session_factory() as db:
+        try:
+            yield db
+        finally:
+            # Nothing should be pending; discard anything that is
+            await db.rollback()
+
+
 # Database initialization
+def _init_sqlite_file() -> None:
+    """Apply the file-layout PRAGMAs when the SQLite database file is new."""
+    database = sync_engine.url.database
+    if not IS_SQLITE or not database or "memory" in database:
+        return
+    if os.path.exists(database) and os.path.getsize(database) > 0:
+        return
+    
+    connection = sqlite3.connect(database)
+    try:
+        connection.executescript(SQLITE_INIT_SCRIPT)
+    finally:
+        connection.close()
+    logger.info("SQLite database file initialized")
+
+
+def _check_existing_schema(inspector, tables) -> None:
+    """
+    Refuse to start on tables that predate a storage change.
+    
+    create_all never alters existing tables, so a database created before
+    a column was added or converted (e.g. money to integer cents) would
+    otherwise load silently wrong values or fail on every query.
+    
+    Args:
+        inspector: Inspector bound to the connection being initialized
+        tables: Model tables that already exist in the database
+        
+    Raises:
+        RuntimeError: If a column is missing or still stored as NUMERIC
+            where the model stores integers
+    """
+    for table in tables:
+        stored = {column["name"]: column["type"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            stored_type = stored.get(column.name)
+            model_type = getattr(column.type, "impl_instance", column.type)
+            if stored_type is None or (
+                isinstance(model_type, Integer) and isinstance(stored_type, Numeric)
+            ):
+                raise RuntimeError(
+                    f"Database column {table.name}.{column.name} is missing or has a "
+                    f"legacy type; run 'alembic upgrade head' before starting"
+                )
+
+
+def _create_missing_tables(connection) -> None:
+    """
+    Create tables that do not exist yet.
+    
+    Existing tables are read with a single catalog probe, so create_all can
+    run with checkfirst=False instead of issuing one existence query per
+    table.
+    
+    Args:
+        connection: Sync SQLAlchemy connection
+    """
+    inspector = inspect(connection)
+    existing = set(inspector.get_table_names())
+    missing = [
+        table for table in Base.metadata.sorted_tables
+        if table.name not in existing
+    ]
+    _check_existing_schema(inspector, [
+        table for table in Base.metadata.sorted_tables
+        if table.name in existing
+    ])
+    if missing:
+        Base.metadata.create_all(connection, tables=missing, checkfirst=False)
+
+
 async def init_db() -> None:
     """Initialize database tables."""
+    # Import all models to ensure they're registered
+    from app.models import load_all_models
+    load_all_models()
+    _init_sqlite_file()
+    
     try:
         async with async_engine.begin() as conn:
-            # Import all models to ensure they're registered
-            from app.models import (
-                User, Employee, PayrollRecord, PayPeriod, TimeEntry
-            )
-            
             # Create all tables
-            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_create_missing_tables)
             
         logger.info("Database tables created successfully")
         
@@ -187,14 +333,15 @@ async def init_db() -> None:
 
 def init_sync_db() -> None:
     """Initialize database tables synchronously."""
+    # Import all models to ensure they're registered
+    from app.models import load_all_models
+    load_all_models()
+    _init_sqlite_file()
+    
     try:
-        # Import all models to ensure they're registered
-        from app.models import (
-            User, Employee, PayrollRecord, PayPeriod, TimeEntry
-        )
-        
         # Create all tables
-        Base.metadata.create_all(bind=sync_engine)
+        with sync_engine.begin() as conn:
+            _create_missing_tables(conn)
         
         logger.info("Database tables created successfully (sync)")
         
@@ -204,12 +351,16 @@ def init_sync_db() -> None:
 
 
 # Health check functions
+# Built once so every probe reuses the same compiled statement
+_HEALTH_STMT = text("SELECT 1")
+
+
 def check_db_health() -> bool:
     """Check database health synchronously."""
     try:
-        with sync_session_factory() as db:
-            # Simple query to check connection
-            db.execute("SELECT 1")
+        # Connection-level probe; no session or unit of work needed
+        with sync_engine.connect() as conn:
+            conn.scalar(_HEALTH_STMT)
             return True
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
@@ -219,9 +370,9 @@ def check_db_health() -> bool:
 async def check_async_db_health() -> bool:
     """Check async database health."""
     try:
-        async with async_session_factory() as db:
-            # Simple query to check connection
-            await db.execute("SELECT 1")
+        # Connection-level probe; no session or unit of work needed
+        async with async_engine.connect() as conn:
+            await conn.scalar(_HEALTH_STMT)
             return True
     except Exception as e:
         logger.error(f"Async database health check failed: {e}")
@@ -229,38 +380,42 @@ async def check_async_db_health() -> bool:
 
 
 # Connection pool monitoring
-def get_pool_status() -> dict:
-    """Get connection pool status."""
-    pool = sync_engine.pool
+def _pool_status(pool) -> dict:
+    """Summarize a queue pool's occupancy."""
+    if not isinstance(pool, QueuePool):
+        return {"pool_class": type(pool).__name__}
+    
+    size = pool.size()
+    checked_out = pool.checkedout()
     return {
-        "pool_size": pool.size(),
+        "pool_size": size,
+        "max_overflow": POOL_CONFIG["max_overflow"],
         "checked_in": pool.checkedin(),
-        "checked_out": pool.checkedout(),
+        "checked_out": checked_out,
         "overflow": pool.overflow(),
-        "invalid": pool.invalid(),
-        "total_connections": pool.size() + pool.overflow(),
-        "available_connections": pool.checkedin()
+        "total_connections": size + pool.overflow(),
+        "available_connections": pool.checkedin(),
+        # Near 1.0 means requests are about to wait on pool_timeout
+        "utilization": round(checked_out / (size + POOL_CONFIG["max_overflow"]), 3),
     }
 
 
+def get_pool_status() -> dict:
+    """Get connection pool status."""
+    return _pool_status(sync_engine.pool)
+
+
 def get_async_pool_status() -> dict:
     """Get async connection pool status."""
-    pool = async_engine.pool
-    return {
-        "pool_size": pool.size(),
-        "checked_in": pool.checkedin(),
-        "checked_out": pool.checkedout(),
-        "overflow": pool.overflow(),
-        "invalid": pool.invalid(),
-        "total_connections": pool.size() + pool.overflow(),
-        "available_connections": pool.checkedin()
-    }
+    return _pool_status(async_engine.pool)
 
 
 # Cleanup function
 async def cleanup_db():
     """Cleanup database connections."""
     try:
+        # Disposing closes every pooled connection, which runs PRAGMA optimize
+        # through the "close" listeners above
         await async_engine.dispose()
         sync_engine.dispose()
         logger.info("Database connections cleaned up")
@@ -275,8 +430,10 @@ __all__ = [
     "async_engine",
     "sync_session_factory",
     "async_session_factory",
+    "readonly_async_session_factory",
     "get_db",
     "get_async_db",
+    "get_async_db_ro",
     "init_db",
     "init_sync_db",
     "check_db_health",
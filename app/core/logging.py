@@ -5,48 +5,123 @@ This module provides structured logging with JSON formatting,
 request correlation IDs, and performance monitoring.
 """
 
+import atexit
 import json
 import logging
 import logging.config
+import os
+import queue
 import sys
+import threading
 import time
 import uuid
-from typing import Dict, Any, Optional
-from datetime import datetime
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
 from contextlib import contextmanager
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.core.config import get_settings
+from app.core.config import settings
 
-settings = get_settings()
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values the JSON encoder doesn't handle natively."""
+    if isinstance(value, datetime):
+        return value.isoformat().replace("+00:00", "Z")
+    return str(value)
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def _dumps(data: Dict[str, Any]) -> str:
+        """Serialize a log payload with orjson."""
+        return orjson.dumps(data, default=_json_default, option=_ORJSON_OPTIONS).decode()
+else:
+    def _dumps(data: Dict[str, Any]) -> str:
+        """Serialize a log payload with the stdlib encoder."""
+        return json.dumps(data, ensure_ascii=False, default=_json_default)
+
+
+def _get_hostname() -> str:
+    """Resolve the host name once for all log records."""
+    import socket
+    try:
+        return socket.gethostname()
+    except Exception:
+        return "unknown"
+
+
+# Fields that are identical on every record, computed once at import time
+_STATIC_FIELDS = {
+    "service": "payroll-api",
+    "version": "1.0.0",
+    "hostname": _get_hostname(),
+}
+
+# Optional record attributes copied into the JSON payload as (attr, key)
+_OPTIONAL_FIELDS = (
+    ("correlation_id", "correlation_id"),
+    ("request_id", "request_id"),
+    ("user_id", "user_id"),
+    ("ip_address", "ip_address"),
+    ("method", "http_method"),
+    ("path", "http_path"),
+    ("status_code", "http_status"),
+    ("duration", "duration_ms"),
+)
+
+_OPTIONAL_ATTRS = frozenset(attr for attr, _ in _OPTIONAL_FIELDS)
+
+
+class ContextLoggerAdapter(logging.LoggerAdapter):
+    """
+    Logger adapter that packs structured fields into a single ``extras`` dict.
+    
+    Request attributes listed in ``_OPTIONAL_FIELDS`` stay on the record so
+    JSONFormatter can map them; every other ``extra`` key, plus any context
+    bound to the adapter, is emitted as-is under its own name.
+    """
+    
+    def __init__(self, logger: logging.Logger, extra: Optional[Dict[str, Any]] = None):
+        super().__init__(logger, extra or {})
+    
+    def process(self, msg, kwargs):
+        """Move caller and bound extra fields into the record's extras dict."""
+        extra = kwargs.get("extra")
+        if extra or self.extra:
+            record_extra = {}
+            extras = dict(self.extra)
+            if extra:
+                for key, value in extra.items():
+                    if key in _OPTIONAL_ATTRS:
+                        record_extra[key] = value
+                    else:
+                        extras[key] = value
+            record_extra["extras"] = extras
+            kwargs["extra"] = record_extra
+        return msg, kwargs
 
 
 class JSONFormatter(logging.Formatter):
     """JSON formatter for structured logging."""
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        import socket
-        try:
-            self.hostname = socket.gethostname()
-        except Exception:
-            self.hostname = "unknown"
-        self.service_name = "payroll-api"
-        self.version = "1.0.0"
-    
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
         log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
-            "service": self.service_name,
-            "version": self.version,
-            "hostname": self.hostname,
+            **_STATIC_FIELDS,
             "process_id": record.process,
             "thread_id": record.thread,
             "module": record.module,
@@ -54,31 +129,13 @@ class JSONFormatter(logging.Formatter):
             "line": record.lineno,
         }
         
-        # Add correlation ID if available
-        if hasattr(record, 'correlation_id'):
-            log_data["correlation_id"] = record.correlation_id
-        
-        # Add request info if available
-        if hasattr(record, 'request_id'):
-            log_data["request_id"] = record.request_id
-        
-        if hasattr(record, 'user_id'):
-            log_data["user_id"] = record.user_id
-        
-        if hasattr(record, 'ip_address'):
-            log_data["ip_address"] = record.ip_address
-        
-        if hasattr(record, 'method'):
-            log_data["http_method"] = record.method
-        
-        if hasattr(record, 'path'):
-            log_data["http_path"] = record.path
-        
-        if hasattr(record, 'status_code'):
-            log_data["http_status"] = record.status_code
-        
-        if hasattr(record, 'duration'):
-            log_data["duration_ms"] = record.duration
+        # Add correlation ID, request info and timing if available. Reading
+        # the record's __dict__ avoids getattr's AttributeError on each miss.
+        record_dict = record.__dict__
+        for attr, key in _OPTIONAL_FIELDS:
+            value = record_dict.get(attr)
+            if value is not None:
+                log_data[key] = value
         
         # Add exception info if available
         if record.exc_info:
@@ -88,119 +145,177 @@ class JSONFormatter(logging.Formatter):
                 "traceback": self.formatException(record.exc_info)
             }
         
-        # Add extra fields
-        for key, value in record.__dict__.items():
-            if key.startswith('extra_'):
-                log_data[key[6:]] = value  # Remove 'extra_' prefix
+        # Add extra fields, packed into one dict by ContextLoggerAdapter;
+        # they never override the core fields set above
+        extras = record_dict.get("extras")
+        if extras:
+            log_data = {**extras, **log_data}
         
-        return json.dumps(log_data, ensure_ascii=False)
+        return _dumps(log_data)
+
+
+# Requests slower than this (in milliseconds) are logged with full detail
+SLOW_REQUEST_MS = 2000
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
     Request logging middleware for structured request/response logging.
     
-    Adds correlation IDs and logs request/response details.
+    Adds correlation IDs and logs request/response details. Implemented as
+    a plain ASGI middleware so requests are not routed through the extra
+    task and memory streams that BaseHTTPMiddleware introduces.
     """
     
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
-        self.logger = logging.getLogger("app.request")
+        self.app = app
+        self.logger = ContextLoggerAdapter(logging.getLogger("app.request"))
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Log request and response details."""
-        # Generate correlation ID
-        correlation_id = str(uuid.uuid4())
-        request.state.correlation_id = correlation_id
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Generate request ID
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+        # Generate correlation and request IDs, exposed via request.state
+        correlation_id = uuid.uuid4().hex
+        request_id = uuid.uuid4().hex
+        state = scope.setdefault("state", {})
+        state["correlation_id"] = correlation_id
+        state["request_id"] = request_id
         
-        # Get client IP
-        client_ip = self.get_client_ip(request)
+        method = scope["method"]
+        path = scope["path"]
         
-        # Start timer
-        start_time = time.time()
+        # Get client IP and user agent, cached for downstream handlers
+        client_ip, user_agent = self.get_client_info(scope)
+        state["client_ip"] = client_ip
+        state["user_agent"] = user_agent
         
-        # Log request
-        self.logger.info(
-            f"Request started: {request.method} {request.url.path}",
-            extra={
-                'correlation_id': correlation_id,
-                'request_id': request_id,
-                'method': request.method,
-                'path': request.url.path,
-                'query_params': str(request.query_params),
-                'ip_address': client_ip,
-                'user_agent': request.headers.get('user-agent', ''),
-                'extra_event': 'request_start'
-            }
-        )
+        # Start timer
+        start_ns = time.perf_counter_ns()
         
-        # Process request
-        try:
-            response = await call_next(request)
-            
-            # Calculate duration
-            duration = (time.time() - start_time) * 1000  # Convert to milliseconds
-            
-            # Log response
-            self.logger.info(
-                f"Request completed: {request.method} {request.url.path} - {response.status_code}",
+        # Log request start at DEBUG only; request_end carries the detail
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Request started: %s %s", method, path,
                 extra={
                     'correlation_id': correlation_id,
                     'request_id': request_id,
-                    'method': request.method,
-                    'path': request.url.path,
-                    'status_code': response.status_code,
-                    'duration': duration,
+                    'method': method,
+                    'path': path,
+                    'query_params': scope.get("query_string", b"").decode("latin-1"),
                     'ip_address': client_ip,
-                    'extra_event': 'request_end'
+                    'user_agent': user_agent,
+                    'event': 'request_start'
                 }
             )
-            
-            # Add correlation ID to response headers
-            response.headers["X-Correlation-ID"] = correlation_id
-            response.headers["X-Request-ID"] = request_id
-            
-            return response
-            
+        
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add correlation ID to response headers
+                response_headers = MutableHeaders(scope=message)
+                response_headers.append("X-Correlation-ID", correlation_id)
+                response_headers.append("X-Request-ID", request_id)
+            await send(message)
+        
+        # Process request
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            # Calculate duration
-            duration = (time.time() - start_time) * 1000
+            # Calculate duration in milliseconds
+            duration = (time.perf_counter_ns() - start_ns) / 1_000_000
             
             # Log error
             self.logger.error(
-                f"Request failed: {request.method} {request.url.path} - {type(e).__name__}: {str(e)}",
+                "Request failed: %s %s - %s: %s",
+                method, path, type(e).__name__, e,
                 extra={
                     'correlation_id': correlation_id,
                     'request_id': request_id,
-                    'method': request.method,
-                    'path': request.url.path,
+                    'method': method,
+                    'path': path,
                     'duration': duration,
                     'ip_address': client_ip,
-                    'extra_event': 'request_error',
-                    'extra_error_type': type(e).__name__,
-                    'extra_error_message': str(e)
+                    'event': 'request_error',
+                    'error_type': type(e).__name__,
+                    'error_message': str(e)
                 },
                 exc_info=True
             )
             
             raise
+        
+        # Calculate duration in milliseconds
+        duration = (time.perf_counter_ns() - start_ns) / 1_000_000
+        
+        # Log response: one short line for fast successful requests, full
+        # detail only when the request was slow or returned an error
+        if self.logger.isEnabledFor(logging.INFO):
+            if duration < SLOW_REQUEST_MS and status_code < 400:
+                extra = {
+                    'correlation_id': correlation_id,
+                    'method': method,
+                    'path': path,
+                    'status_code': status_code,
+                    'duration': duration,
+                    'event': 'request_end'
+                }
+            else:
+                extra = {
+                    'correlation_id': correlation_id,
+                    'request_id': request_id,
+                    'method': method,
+                    'path': path,
+                    'status_code': status_code,
+                    'duration': duration,
+                    'query_params': scope.get("query_string", b"").decode("latin-1"),
+                    'ip_address': client_ip,
+                    'user_agent': user_agent,
+                    'event': 'request_end'
+                }
+            self.logger.info(
+                "Request completed: %s %s - %s", method, path, status_code,
+                extra=extra
+            )
     
-    def get_client_ip(self, request: Request) -> str:
-        """Get client IP address."""
-        # Check for forwarded headers
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
+    def get_client_info(self, scope: Scope) -> Tuple[str, str]:
+        """
+        Get client IP address and user agent in a single header pass.
+        
+        Args:
+            scope: ASGI connection scope
+            
+        Returns:
+            Tuple of (client IP, user agent)
+        """
+        forwarded_for = real_ip = user_agent = None
+        # ASGI header names are already lower-cased; keep the first occurrence
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                if forwarded_for is None:
+                    forwarded_for = value
+            elif name == b"x-real-ip":
+                if real_ip is None:
+                    real_ip = value
+            elif name == b"user-agent":
+                if user_agent is None:
+                    user_agent = value
         
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
+        # Check for forwarded headers; only the first hop is decoded
+        if forwarded_for:
+            client_ip = forwarded_for.split(b",", 1)[0].strip().decode("latin-1")
+        elif real_ip:
+            client_ip = real_ip.decode("latin-1")
+        else:
+            client = scope.get("client")
+            client_ip = client[0] if client else "unknown"
         
-        return request.client.host if request.client else "unknown"
+        return client_ip, user_agent.decode("latin-1") if user_agent else ""
 
 
 class DatabaseLoggingFilter(logging.Filter):
@@ -216,68 +331,72 @@ class DatabaseLoggingFilter(logging.Filter):
 
 
 class PerformanceMonitor:
-    """Performance monitoring utility."""
+    """
+    Performance monitoring utility.
+    
+    Safe to share across threads and concurrent requests: each update holds a
+    short lock, since read-modify-write on counters and floats is not atomic.
+    """
     
     def __init__(self):
-        self.logger = logging.getLogger("app.performance")
-        self.metrics = {
-            'requests_total': 0,
-            'requests_by_status': {},
-            'slow_requests': 0,
-            'avg_response_time': 0,
-            'max_response_time': 0,
-            'min_response_time': float('inf')
-        }
+        self.logger = ContextLoggerAdapter(logging.getLogger("app.performance"))
+        self._lock = threading.Lock()
+        self._requests_total = 0
+        self._requests_by_status: Counter = Counter()
+        self._slow_requests = 0
+        self._response_time_sum = 0.0
+        self._max_response_time = 0.0
+        self._min_response_time = float('inf')
     
     def record_request(self, duration: float, status_code: int, path: str):
         """Record request metrics."""
-        self.metrics['requests_total'] += 1
-        
-        # Update status code counts
+        duration_ms = duration * 1000
         status_group = f"{status_code // 100}xx"
-        self.metrics['requests_by_status'][status_group] = (
-            self.metrics['requests_by_status'].get(status_group, 0) + 1
-        )
+        is_slow = duration_ms > SLOW_REQUEST_MS
         
-        # Update timing metrics
-        duration_ms = duration * 1000
+        with self._lock:
+            self._requests_total += 1
+            self._requests_by_status[status_group] += 1
+            self._response_time_sum += duration_ms
+            if duration_ms > self._max_response_time:
+                self._max_response_time = duration_ms
+            if duration_ms < self._min_response_time:
+                self._min_response_time = duration_ms
+            if is_slow:
+                self._slow_requests += 1
         
-        if duration_ms > 2000:  # 2 seconds threshold
-            self.metrics['slow_requests'] += 1
-            
+        if is_slow:
             # Log slow request
             self.logger.warning(
                 f"Slow request detected: {path} took {duration_ms:.2f}ms",
                 extra={
-                    'extra_event': 'slow_request',
-                    'extra_duration_ms': duration_ms,
-                    'extra_path': path,
-                    'extra_status_code': status_code
+                    'event': 'slow_request',
+                    'duration_ms': duration_ms,
+                    'path': path,
+                    'status_code': status_code
                 }
             )
-        
-        # Update response time stats
-        self.metrics['max_response_time'] = max(self.metrics['max_response_time'], duration_ms)
-        self.metrics['min_response_time'] = min(self.metrics['min_response_time'], duration_ms)
-        
-        # Update average (simple moving average)
-        current_avg = self.metrics['avg_response_time']
-        total_requests = self.metrics['requests_total']
-        self.metrics['avg_response_time'] = (
-            (current_avg * (total_requests - 1) + duration_ms) / total_requests
-        )
     
     def get_metrics(self) -> Dict[str, Any]:
-        """Get current performance metrics."""
-        return self.metrics.copy()
+        """Get a consistent snapshot of the current performance metrics."""
+        with self._lock:
+            total = self._requests_total
+            return {
+                'requests_total': total,
+                'requests_by_status': dict(self._requests_by_status),
+                'slow_requests': self._slow_requests,
+                'avg_response_time': self._response_time_sum / total if total else 0,
+                'max_response_time': self._max_response_time,
+                'min_response_time': self._min_response_time
+            }
     
     def log_metrics(self):
         """Log current metrics."""
         self.logger.info(
             "Performance metrics",
             extra={
-                'extra_event': 'performance_metrics',
-                'extra_metrics': self.get_metrics()
+                'event': 'performance_metrics',
+                'metrics': self.get_metrics()
             }
         )
 
@@ -286,8 +405,64 @@ class PerformanceMonitor:
 performance_monitor = PerformanceMonitor()
 
 
+class LocalQueueHandler(QueueHandler):
+    """
+    Queue handler for a listener running in the same process.
+    
+    Records are enqueued as-is, so message and JSON formatting happen on the
+    listener thread rather than on the thread that emitted the record.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# Listener threads that write queued records to the log files
+_queue_listeners: List[QueueListener] = []
+
+
+def _queue_to(handler: logging.Handler) -> QueueHandler:
+    """Start a listener thread for ``handler`` and return the handler feeding it."""
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    _queue_listeners.append(listener)
+    return LocalQueueHandler(log_queue)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the file-writing listener threads."""
+    while _queue_listeners:
+        listener = _queue_listeners.pop()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
 def setup_logging():
     """Setup structured logging configuration."""
+    # Reconfiguring replaces the file handlers, so retire the old listeners
+    stop_logging()
+    
+    # Create logs directory if it doesn't exist
+    os.makedirs("logs", exist_ok=True)
+    
+    # File handlers run on background listener threads; loggers only enqueue
+    file_handler = RotatingFileHandler(
+        "logs/payroll-api.log",
+        maxBytes=10485760,  # 10MB
+        backupCount=5
+    )
+    file_handler.setFormatter(JSONFormatter())
+    file_handler.addFilter(DatabaseLoggingFilter())
+    
+    error_file_handler = RotatingFileHandler(
+        "logs/payroll-api-errors.log",
+        maxBytes=10485760,  # 10MB
+        backupCount=5
+    )
+    error_file_handler.setFormatter(JSONFormatter())
+    error_file_handler.setLevel(logging.ERROR)
     
     # Define logging configuration
     logging_config = {
@@ -314,19 +489,12 @@ def setup_logging():
                 "filters": ["database_filter"]
             },
             "file": {
-                "class": "logging.handlers.RotatingFileHandler",
-                "formatter": "json",
-                "filename": "logs/payroll-api.log",
-                "maxBytes": 10485760,  # 10MB
-                "backupCount": 5,
-                "filters": ["database_filter"]
+                "()": _queue_to,
+                "handler": file_handler
             },
             "error_file": {
-                "class": "logging.handlers.RotatingFileHandler",
-                "formatter": "json",
-                "filename": "logs/payroll-api-errors.log",
-                "maxBytes": 10485760,  # 10MB
-                "backupCount": 5,
+                "()": _queue_to,
+                "handler": error_file_handler,
                 "level": "ERROR"
             }
         },
@@ -371,18 +539,14 @@ def setup_logging():
     # Apply logging configuration
     logging.config.dictConfig(logging_config)
     
-    # Create logs directory if it doesn't exist
-    import os
-    os.makedirs("logs", exist_ok=True)
-    
     # Log startup message
-    logger = logging.getLogger("app")
+    logger = ContextLoggerAdapter(logging.getLogger("app"))
     logger.info(
         "Structured logging initialized",
         extra={
-            'extra_event': 'logging_init',
-            'extra_environment': settings.ENVIRONMENT,
-            'extra_debug': settings.DEBUG
+            'event': 'logging_init',
+            'environment': settings.ENVIRONMENT,
+            'debug': settings.DEBUG
         }
     )
 
@@ -392,34 +556,36 @@ def log_performance(operation_name: str, logger: Optional[logging.Logger] = None
     """Context manager for logging performance of operations."""
     if logger is None:
         logger = logging.getLogger("app.performance")
+    if not isinstance(logger, ContextLoggerAdapter):
+        logger = ContextLoggerAdapter(logger)
     
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     
     try:
         yield
         
-        duration = time.time() - start_time
+        duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
         logger.info(
             f"Operation completed: {operation_name}",
             extra={
-                'extra_event': 'operation_performance',
-                'extra_operation': operation_name,
-                'extra_duration_ms': duration * 1000,
-                'extra_status': 'success'
+                'event': 'operation_performance',
+                'operation': operation_name,
+                'duration_ms': duration_ms,
+                'status': 'success'
             }
         )
         
     except Exception as e:
-        duration = time.time() - start_time
+        duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
         logger.error(
             f"Operation failed: {operation_name} - {type(e).__name__}: {str(e)}",
             extra={
-                'extra_event': 'operation_performance',
-                'extra_operation': operation_name,
-                'extra_duration_ms': duration * 1000,
-                'extra_status': 'error',
-                'extra_error_type': type(e).__name__,
-                'extra_error_message': str(e)
+                'event': 'operation_performance',
+                'operation': operation_name,
+                'duration_ms': duration_ms,
+                'status': 'error',
+                'error_type': type(e).__name__,
+                'error_message': str(e)
             },
             exc_info=True
         )
@@ -431,6 +597,9 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(f"app.{name}")
 
 
+# Write out anything still queued when the process exits
+atexit.register(stop_logging)
+
 # Initialize logging on module import
 if settings.ENVIRONMENT in ["production", "staging"]:
     setup_logging() 
\ No newline at end of file
@@ -5,45 +5,107 @@ This module provides security enhancements including rate limiting,
 request validation, and security headers.
 """
 
+import re
 import time
 import logging
-from typing import Dict, Any, Optional
-from collections import defaultdict, deque
+from functools import lru_cache
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from datetime import datetime, timedelta
 import asyncio
+import weakref
 from ipaddress import ip_address, IPv4Address, IPv6Address
 
-from fastapi import Request, Response, HTTPException, status
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.clock import coarse_monotonic, coarse_time
+
+try:
+    import hyperscan
+except ImportError:  # pragma: no cover - optional dependency
+    hyperscan = None
 
 logger = logging.getLogger(__name__)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class PathPrefixTrie:
+    """
+    Character trie mapping path prefixes to policy values.
+    
+    Lookup walks the path once and returns the value of the longest
+    registered prefix, so its cost depends on the path length rather than
+    the number of patterns.
+    """
+    
+    _VALUE = object()  # Key under which a node stores its value
+    
+    def __init__(self, patterns: Dict[str, Any], default: Any):
+        self.default = default
+        self._root: Dict[Any, Any] = {}
+        for pattern, value in patterns.items():
+            node = self._root
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node[self._VALUE] = value
+    
+    def match(self, path: str) -> Any:
+        """
+        Get the value for the longest registered prefix of a path.
+        
+        Args:
+            path: Request path
+            
+        Returns:
+            Matched value, or the default when no prefix matches
+        """
+        node = self._root
+        value = node.get(self._VALUE, self.default)
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                break
+            if self._VALUE in node:
+                value = node[self._VALUE]
+        return value
+
+
+class RateLimitMiddleware:
     """
     Rate limiting middleware to prevent abuse.
     
-    Implements a sliding window rate limiter with different limits
-    for different types of requests.
+    Implements a fixed-window rate limiter with different limits
+    for different types of requests. Each IP holds a single counter and
+    the start of its current one-minute window, in one of ``SHARD_COUNT``
+    tables so expired entries can be swept shard by shard.
     """
     
+    WINDOW_SECONDS = 60
+    SHARD_COUNT = 16  # Must be a power of two
+    
     def __init__(
         self,
         app: ASGIApp,
         default_requests_per_minute: int = 60,
         auth_requests_per_minute: int = 10,
-        cleanup_interval: int = 300
+        cleanup_interval: int = 300,
+        exempt_paths: Tuple[str, ...] = ()
     ):
-        super().__init__(app)
+        self.app = app
         self.default_rpm = default_requests_per_minute
         self.auth_rpm = auth_requests_per_minute
         self.cleanup_interval = cleanup_interval
         
-        # Store request timestamps for each IP
-        self.request_history: Dict[str, deque] = defaultdict(deque)
-        self.last_cleanup = time.time()
+        # Monitoring and documentation paths skip rate-limit bookkeeping
+        self.exempt_paths = frozenset(exempt_paths)
+        
+        # Request count and window start (monotonic seconds) for each IP
+        self.shards: List[Dict[str, Tuple[int, float]]] = [
+            {} for _ in range(self.SHARD_COUNT)
+        ]
+        self._cleanup_task: Optional[asyncio.Task] = None
+        _rate_limiters.add(self)
         
         # Define rate limits for different endpoints
         self.rate_limits = {
@@ -54,16 +116,29 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             '/api/v1/auth/reset-password': 3,   # Very restrictive
             'default': default_requests_per_minute
         }
+        
+        # Paths repeat across requests, so memoize the trie walk per path
+        self._rate_limit_trie = PathPrefixTrie(
+            {pattern: limit for pattern, limit in self.rate_limits.items() if pattern != 'default'},
+            self.rate_limits['default']
+        )
+        self._rate_limit_lookup = lru_cache(maxsize=1024)(self._rate_limit_trie.match)
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request with rate limiting."""
-        client_ip = self.get_client_ip(request)
-        path = request.url.path
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        
+        client_ip = self.get_client_ip(scope)
+        path = scope["path"]
         
-        # Check rate limit
-        if not self.is_allowed(client_ip, path):
+        # Check and count the request in one step
+        limit = self.get_rate_limit(path)
+        allowed, remaining, reset_in = self.check_and_record(client_ip, limit)
+        if not allowed:
             logger.warning(f"Rate limit exceeded for IP {client_ip} on path {path}")
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={
                     "error": "Rate limit exceeded",
@@ -72,95 +147,148 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 },
                 headers={"Retry-After": "60"}
             )
-        
-        # Record the request
-        self.record_request(client_ip)
-        
-        # Periodic cleanup
-        if time.time() - self.last_cleanup > self.cleanup_interval:
-            self.cleanup_old_requests()
-            self.last_cleanup = time.time()
+            await response(scope, receive, send)
+            return
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add rate limit headers
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(limit)
+                headers["X-RateLimit-Remaining"] = str(remaining)
+                headers["X-RateLimit-Reset"] = str(int(coarse_time() + reset_in))
+            await send(message)
         
         # Process request
-        response = await call_next(request)
-        
-        # Add rate limit headers
-        limit = self.get_rate_limit(path)
-        remaining = max(0, limit - len(self.request_history[client_ip]))
-        
-        response.headers["X-RateLimit-Limit"] = str(limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(int(time.time() + 60))
-        
-        return response
+        await self.app(scope, receive, send_wrapper)
     
-    def get_client_ip(self, request: Request) -> str:
+    def get_client_ip(self, scope: Scope) -> str:
         """Get client IP address with proxy support."""
+        forwarded_for = real_ip = None
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                if forwarded_for is None:
+                    forwarded_for = value
+            elif name == b"x-real-ip":
+                if real_ip is None:
+                    real_ip = value
+        
         # Check for forwarded headers (common with proxies/load balancers)
-        forwarded_for = request.headers.get("X-Forwarded-For")
         if forwarded_for:
             # Take the first IP in the chain
-            return forwarded_for.split(",")[0].strip()
+            return forwarded_for.split(b",", 1)[0].strip().decode("latin-1")
         
-        real_ip = request.headers.get("X-Real-IP")
         if real_ip:
-            return real_ip
+            return real_ip.decode("latin-1")
         
         # Fallback to direct client IP
-        return request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        return client[0] if client else "unknown"
     
     def get_rate_limit(self, path: str) -> int:
         """Get rate limit for a specific path."""
-        # Check for exact match first
-        if path in self.rate_limits:
-            return self.rate_limits[path]
-        
-        # Check for pattern matches
-        for pattern, limit in self.rate_limits.items():
-            if pattern != 'default' and path.startswith(pattern):
-                return limit
-        
-        return self.rate_limits['default']
+        return self._rate_limit_lookup(path)
     
-    def is_allowed(self, client_ip: str, path: str) -> bool:
-        """Check if request is allowed based on rate limits."""
-        limit = self.get_rate_limit(path)
-        now = time.time()
-        cutoff = now - 60  # 1 minute window
+    def _shard(self, client_ip: str) -> Dict[str, Tuple[int, float]]:
+        """Get the counter table holding an IP."""
+        return self.shards[hash(client_ip) & (self.SHARD_COUNT - 1)]
+    
+    def check_and_record(self, client_ip: str, limit: int) -> Tuple[bool, int, float]:
+        """
+        Check a request against the limit and count it if allowed.
+        
+        The check and the update happen in one synchronous step, so no other
+        request can interleave. A shared backend (e.g. Redis) must keep the
+        same contract: do the check-and-increment atomically, and never hold
+        a lock across a sleep or other I/O.
+        
+        Args:
+            client_ip: Client IP address
+            limit: Requests allowed per window
+            
+        Returns:
+            Tuple of (allowed, remaining requests, seconds until the window resets)
+        """
+        now = coarse_monotonic()
+        shard = self._shard(client_ip)
+        
+        count, window_start = shard.get(client_ip, (0, now))
         
-        # Get request history for this IP
-        history = self.request_history[client_ip]
+        # Start a new window once the current one has elapsed
+        if now - window_start >= self.WINDOW_SECONDS:
+            count, window_start = 0, now
         
-        # Remove old requests (older than 1 minute)
-        while history and history[0] < cutoff:
-            history.popleft()
+        reset_in = window_start + self.WINDOW_SECONDS - now
+        if count >= limit:
+            return False, 0, reset_in
         
-        # Check if under limit
-        return len(history) < limit
+        count += 1
+        shard[client_ip] = (count, window_start)
+        return True, limit - count, reset_in
     
-    def record_request(self, client_ip: str) -> None:
-        """Record a request timestamp for an IP."""
-        self.request_history[client_ip].append(time.time())
+    async def cleanup_old_requests(self) -> None:
+        """Drop counters whose window has expired, yielding between shards."""
+        cutoff = coarse_monotonic() - self.WINDOW_SECONDS
+        active = 0
+        
+        for shard in self.shards:
+            for ip, (_, window_start) in list(shard.items()):
+                if window_start < cutoff:
+                    del shard[ip]
+            active += len(shard)
+            await asyncio.sleep(0)
+        
+        logger.info(f"Cleaned up rate limit history. Active IPs: {active}")
     
-    def cleanup_old_requests(self) -> None:
-        """Clean up old request history data."""
-        cutoff = time.time() - 3600  # Keep history for 1 hour
-        
-        for ip in list(self.request_history.keys()):
-            history = self.request_history[ip]
-            
-            # Remove old requests
-            while history and history[0] < cutoff:
-                history.popleft()
-            
-            # Remove empty histories
-            if not history:
-                del self.request_history[ip]
-        
-        logger.info(f"Cleaned up rate limit history. Active IPs: {len(self.request_history)}")
+    async def _cleanup_loop(self) -> None:
+        """Run cleanup_old_requests every ``cleanup_interval`` seconds."""
+        while True:
+            await asyncio.sleep(self.cleanup_interval)
+            try:
+                await self.cleanup_old_requests()
+            except Exception as e:
+                logger.error(f"Error in rate limit cleanup task: {e}")
+    
+    def start_cleanup(self) -> None:
+        """Start sweeping expired counters in the background on the running loop."""
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+    
+    async def stop_cleanup(self) -> None:
+        """Cancel the background sweep and wait for it to finish."""
+        task, self._cleanup_task = self._cleanup_task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+# Live rate limiters, so the application lifespan can start and stop their
+# cleanup tasks; Starlette builds the middleware before lifespan startup
+_rate_limiters: "weakref.WeakSet[RateLimitMiddleware]" = weakref.WeakSet()
+
+
+def start_rate_limit_cleanup() -> None:
+    """
+    Start the counter cleanup task of every rate limiter.
+    
+    Must be called from within a running event loop (e.g. the application
+    lifespan); pair with ``stop_rate_limit_cleanup`` on shutdown.
+    """
+    for limiter in list(_rate_limiters):
+        limiter.start_cleanup()
+
+
+async def stop_rate_limit_cleanup() -> None:
+    """Stop the counter cleanup task of every rate limiter."""
+    for limiter in list(_rate_limiters):
+        await limiter.stop_cleanup()
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """
     Security headers middleware to add security-related HTTP headers.
     
@@ -168,7 +296,7 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """
     
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
         
         # Define security headers
         self.security_headers = {
@@ -215,28 +343,114 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             # Remove powered by headers
             "X-Powered-By": "",
         }
+        
+        # Values never change, so encode them once for the raw ASGI header list
+        self._raw_headers: List[Tuple[bytes, bytes]] = [
+            (header.lower().encode("latin-1"), value.encode("latin-1"))
+            for header, value in self.security_headers.items()
+        ]
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Add security headers to response."""
-        response = await call_next(request)
-        
-        # Add security headers
-        for header, value in self.security_headers.items():
-            response.headers[header] = value
-        
-        return response
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add security headers
+                message["headers"] = list(message.get("headers", ()))
+                message["headers"].extend(self._raw_headers)
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
 
 
-class RequestValidationMiddleware(BaseHTTPMiddleware):
+class FastPathMiddleware:
     """
-    Request validation middleware for additional security checks.
+    Early responder for high-frequency monitoring endpoints.
     
-    Validates requests for suspicious patterns and malicious content.
+    Answers ``GET`` requests for the configured paths directly, before the
+    rest of the middleware stack runs, so load-balancer probes do not pay
+    for logging, validation, rate limiting and compression.
+    """
+    
+    def __init__(self, app: ASGIApp, routes: Dict[str, Callable[[], bytes]]):
+        self.app = app
+        self.routes = routes
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve fast-path requests, pass everything else through."""
+        render = self.routes.get(scope["path"]) if scope["type"] == "http" else None
+        if render is None or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        
+        body = render()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"cache-control", b"no-cache"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class RequestSizeLimitMiddleware:
+    """
+    Request size limit middleware.
+    
+    Rejects requests whose declared Content-Length exceeds the limit straight
+    from the ASGI scope, before the body is read or any other middleware
+    runs.
     """
     
     def __init__(self, app: ASGIApp, max_request_size: int = 10 * 1024 * 1024):  # 10MB default
-        super().__init__(app)
+        self.app = app
         self.max_request_size = max_request_size
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Reject oversized requests before passing them on."""
+        if scope["type"] == "http":
+            content_length = next(
+                (value for name, value in scope["headers"] if name == b"content-length"),
+                None
+            )
+            if content_length is not None:
+                try:
+                    size = int(content_length)
+                except ValueError:
+                    response = JSONResponse(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        content={"error": "Invalid Content-Length header"}
+                    )
+                    await response(scope, receive, send)
+                    return
+                
+                if size > self.max_request_size:
+                    logger.warning(f"Request size too large: {size} bytes")
+                    response = JSONResponse(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        content={"error": "Request too large"}
+                    )
+                    await response(scope, receive, send)
+                    return
+        
+        await self.app(scope, receive, send)
+
+
+class RequestValidationMiddleware:
+    """
+    Request validation middleware for additional security checks.
+    
+    Validates requests for suspicious patterns and malicious content.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
         
         # Define suspicious patterns
         self.suspicious_patterns = [
@@ -249,51 +463,82 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
             # Command injection patterns
             r"(?i)(;|\||&|`|\$\(|\$\{)",
         ]
+        
+        # Single case-insensitive alternation, so each input is scanned once
+        patterns = [pattern.replace('(?i)', '') for pattern in self.suspicious_patterns]
+        self._combined_pattern = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in patterns),
+            re.IGNORECASE
+        )
+        
+        # Prefer a Hyperscan multi-pattern database when it is installed
+        self._hs_database = None
+        if hyperscan is not None:
+            try:
+                database = hyperscan.Database()
+                database.compile(
+                    expressions=[pattern.encode() for pattern in patterns],
+                    ids=list(range(len(patterns))),
+                    elements=len(patterns),
+                    flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns),
+                )
+                self._hs_database = database
+            except Exception as e:
+                logger.warning(f"Hyperscan unavailable, using re for request validation: {e}")
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Validate request before processing."""
-        # Check request size
-        if hasattr(request, 'headers'):
-            content_length = request.headers.get('content-length')
-            if content_length and int(content_length) > self.max_request_size:
-                logger.warning(f"Request size too large: {content_length} bytes")
-                return JSONResponse(
-                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                    content={"error": "Request too large"}
-                )
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
         # Validate query parameters
-        if request.url.query:
-            if self.contains_suspicious_content(request.url.query):
-                logger.warning(f"Suspicious query parameters: {request.url.query}")
-                return JSONResponse(
+        query = scope.get("query_string", b"").decode("latin-1")
+        if query:
+            if self.contains_suspicious_content(query):
+                logger.warning(f"Suspicious query parameters: {query}")
+                response = JSONResponse(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     content={"error": "Invalid request parameters"}
                 )
+                await response(scope, receive, send)
+                return
+        
+        # Validate headers as one raw block, a single scan per request
+        raw_headers = b"\n".join(b"%s:%s" % kv for kv in scope["headers"])
+        if self.contains_suspicious_content(raw_headers.decode("latin-1")):
+            logger.warning(f"Suspicious headers on {scope['method']} {scope['path']}")
+            response = JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"error": "Invalid request headers"}
+            )
+            await response(scope, receive, send)
+            return
         
-        # Validate headers
-        for header_name, header_value in request.headers.items():
-            if self.contains_suspicious_content(f"{header_name}:{header_value}"):
-                logger.warning(f"Suspicious header: {header_name}={header_value}")
-                return JSONResponse(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    content={"error": "Invalid request headers"}
-                )
-        
-        return await call_next(request)
+        await self.app(scope, receive, send)
     
     def contains_suspicious_content(self, content: str) -> bool:
         """Check if content contains suspicious patterns."""
-        import re
+        if self._hs_database is None:
+            return self._combined_pattern.search(content) is not None
+        
+        matched = []
         
-        for pattern in self.suspicious_patterns:
-            if re.search(pattern, content):
-                return True
+        def on_match(pattern_id, start, end, flags, context):
+            matched.append(pattern_id)
+            return True  # Stop at the first match
         
-        return False
+        try:
+            self._hs_database.scan(content.encode("utf-8"), match_event_handler=on_match)
+        except hyperscan.error:
+            # Stopping early is reported as an error; anything else is real
+            if not matched:
+                raise
+        
+        return bool(matched)
 
 
-class PerformanceMiddleware(BaseHTTPMiddleware):
+class PerformanceMiddleware:
     """
     Performance monitoring middleware.
     
@@ -301,34 +546,40 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
     """
     
     def __init__(self, app: ASGIApp, slow_request_threshold: float = 2.0):
-        super().__init__(app)
+        self.app = app
         self.slow_request_threshold = slow_request_threshold
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Track request performance."""
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Calculate duration up to the start of the response
+                duration = time.perf_counter() - start_time
+                
+                # Add performance headers
+                headers = MutableHeaders(scope=message)
+                headers["X-Response-Time"] = f"{duration:.4f}s"
+                headers["X-Process-Time"] = f"{duration * 1000:.2f}ms"
+                
+                # Log slow requests
+                if duration > self.slow_request_threshold:
+                    logger.warning(
+                        f"Slow request detected: {scope['method']} {scope['path']} "
+                        f"took {duration:.4f}s"
+                    )
+            await send(message)
         
         # Process request
-        response = await call_next(request)
-        
-        # Calculate duration
-        duration = time.time() - start_time
-        
-        # Add performance headers
-        response.headers["X-Response-Time"] = f"{duration:.4f}s"
-        response.headers["X-Process-Time"] = f"{duration * 1000:.2f}ms"
-        
-        # Log slow requests
-        if duration > self.slow_request_threshold:
-            logger.warning(
-                f"Slow request detected: {request.method} {request.url.path} "
-                f"took {duration:.4f}s"
-            )
-        
-        return response
+        await self.app(scope, receive, send_wrapper)
 
 
-class CacheControlMiddleware(BaseHTTPMiddleware):
+class CacheControlMiddleware:
     """
     Cache control middleware to set appropriate cache headers.
     
@@ -336,7 +587,7 @@ class CacheControlMiddleware(BaseHTTPMiddleware):
     """
     
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
         
         # Define cache policies for different paths
         self.cache_policies = {
@@ -348,32 +599,43 @@ class CacheControlMiddleware(BaseHTTPMiddleware):
             '/api/openapi.json': 'public, max-age=3600',   # 1 hour
             'default': 'private, max-age=300'               # 5 minutes default
         }
+        
+        # Paths repeat across requests, so memoize the trie walk per path
+        self._cache_policy_trie = PathPrefixTrie(
+            {pattern: policy for pattern, policy in self.cache_policies.items() if pattern != 'default'},
+            self.cache_policies['default']
+        )
+        self._cache_policy_lookup = lru_cache(maxsize=1024)(self._cache_policy_trie.match)
+        
+        # Pre-encoded Cache-Control header for each policy
+        self._raw_cache_headers: Dict[str, Tuple[bytes, bytes]] = {
+            policy: (b"cache-control", policy.encode("latin-1"))
+            for policy in self.cache_policies.values()
+        }
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Set cache control headers."""
-        response = await call_next(request)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
         # Get cache policy for path
-        cache_policy = self.get_cache_policy(request.url.path)
-        
-        # Set cache headers
-        response.headers["Cache-Control"] = cache_policy
-        
-        # Add ETag for cacheable responses
-        if response.status_code == 200 and 'max-age' in cache_policy:
-            response.headers["ETag"] = f'"{hash(str(response.body))}"'
-        
-        return response
+        cache_header = self._raw_cache_headers[self.get_cache_policy(scope["path"])]
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Replace any Cache-Control set further in, as the
+                # MutableHeaders assignment did
+                headers = [
+                    header for header in message.get("headers", ())
+                    if header[0].lower() != b"cache-control"
+                ]
+                headers.append(cache_header)
+                message["headers"] = headers
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
     
     def get_cache_policy(self, path: str) -> str:
         """Get cache policy for a path."""
-        # Check for exact matches first
-        if path in self.cache_policies:
-            return self.cache_policies[path]
-        
-        # Check for pattern matches
-        for pattern, policy in self.cache_policies.items():
-            if pattern != 'default' and path.startswith(pattern):
-                return policy
-        
-        return self.cache_policies['default'] 
\ No newline at end of file
+        return self._cache_policy_lookup(path)
@@ -5,27 +5,32 @@ This module provides authentication, authorization, and security
 utilities including JWT token management and password hashing.
 """
 
+import base64
+import hashlib
+import hmac
+import json
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Union
-
-from fastapi import Depends, HTTPException, status
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple, Union
+
+import bcrypt
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer
 from jose import jwt
-from passlib.context import CryptContext
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
-from app.core.config import get_settings
+from app.core.config import settings
 from app.core.database import get_db
 
-settings = get_settings()
-
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt cost factor; existing hashes carry their own and still verify
+BCRYPT_ROUNDS = settings.BCRYPT_ROUNDS
 
 # JWT Token constants
 ALGORITHM = settings.ALGORITHM
@@ -33,6 +38,29 @@ SECRET_KEY = settings.SECRET_KEY
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 
+# HMAC digests for the HS* algorithms; other algorithms go through jose
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+_SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as JWS requires."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# The JWT header is the same for every token, so serialize it once
+# (sorted keys and compact separators, matching jose's output)
+_JWT_HEADER_B64 = _b64url(
+    json.dumps({"alg": ALGORITHM, "typ": "JWT"}, separators=(",", ":"), sort_keys=True).encode("utf-8")
+)
+
+# Verified token payloads keyed by a digest of the token, with their exp.
+# A token's claims cannot change, so repeat requests skip base64/JSON/HMAC;
+# revocation before expiry needs a separate denylist.
+TOKEN_CACHE_MAXSIZE = 4096
+_token_cache: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: Optional[timedelta] = None
@@ -47,14 +75,10 @@ def create_access_token(
     Returns:
         str: Encoded JWT token
     """
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return _encode_token(subject, expires_delta, "access")
 
 
 def create_refresh_token(subject: Union[str, Any]) -> str:
@@ -67,10 +91,102 @@ def create_refresh_token(subject: Union[str, Any]) -> str:
     Returns:
         str: Encoded JWT refresh token
     """
-    expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return _encode_token(subject, timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS), "refresh")
+
+
+def _encode_token(subject: Union[str, Any], expires_delta: timedelta, token_type: str) -> str:
+    """
+    Encode a token with ``exp``, ``sub`` and ``type`` claims.
+    
+    For HS* algorithms only the payload is serialized per call: the header
+    segment is precomputed and the signature is a single ``hmac`` digest.
+    The output is byte-for-byte what ``jwt.encode`` would produce.
+    
+    Args:
+        subject: The subject (usually user ID or username)
+        expires_delta: Lifetime of the token
+        token_type: Value of the ``type`` claim
+        
+    Returns:
+        str: Encoded JWT token
+    """
+    if not isinstance(subject, str):
+        subject = str(subject)
+    expire = int(time.time() + expires_delta.total_seconds())
+    claims = {"exp": expire, "sub": subject, "type": token_type}
+    
+    digest = _HMAC_DIGESTS.get(ALGORITHM)
+    if digest is None:
+        return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+    
+    payload_b64 = _b64url(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    signing_input = _JWT_HEADER_B64 + b"." + payload_b64
+    signature = hmac.new(_SECRET_KEY_BYTES, signing_input, digest).digest()
+    return (signing_input + b"." + _b64url(signature)).decode("ascii")
+
+
+def _b64url_decode(segment: str) -> bytes:
+    """Decode an unpadded base64url segment."""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _decode_hs_token(token: str) -> Dict[str, Any]:
+    """
+    Decode an HS* token, checking the signature before parsing any JSON.
+    
+    The HMAC over the raw ``header.payload`` bytes is compared first, so
+    forged or corrupted tokens are rejected without base64/JSON work on the
+    claims.
+    
+    Args:
+        token: The JWT token to decode
+        
+    Returns:
+        The token claims
+        
+    Raises:
+        jwt.ExpiredSignatureError: If the token has expired
+        jwt.JWTClaimsError: If the nbf/iat/exp claims are invalid or nbf is in the future
+        jwt.JWTError: If the token is malformed or the signature is invalid
+    """
+    try:
+        signing_input, signature = token.encode("ascii").rsplit(b".", 1)
+        header_b64, payload_b64 = signing_input.split(b".")
+        expected = hmac.new(_SECRET_KEY_BYTES, signing_input, _HMAC_DIGESTS[ALGORITHM]).digest()
+        if not hmac.compare_digest(expected, _b64url_decode(signature.decode("ascii"))):
+            raise jwt.JWTError("Signature verification failed.")
+        
+        header = json.loads(_b64url_decode(header_b64.decode("ascii")))
+        if header.get("alg") != ALGORITHM:
+            raise jwt.JWTError("The specified alg value is not allowed")
+        payload = json.loads(_b64url_decode(payload_b64.decode("ascii")))
+    except (ValueError, TypeError, AttributeError) as e:
+        raise jwt.JWTError(f"Invalid token: {e}")
+    
+    if not isinstance(payload, dict):
+        raise jwt.JWTError("Invalid payload")
+    
+    # Same time-claim checks python-jose applies (no leeway)
+    now = time.time()
+    iat = payload.get("iat")
+    if iat is not None and not isinstance(iat, (int, float)):
+        raise jwt.JWTClaimsError("Issued At claim (iat) must be an integer.")
+    
+    nbf = payload.get("nbf")
+    if nbf is not None:
+        if not isinstance(nbf, (int, float)):
+            raise jwt.JWTClaimsError("Not Before claim (nbf) must be an integer.")
+        if nbf > now:
+            raise jwt.JWTClaimsError("The token is not yet valid (nbf)")
+    
+    exp = payload.get("exp")
+    if exp is not None:
+        if not isinstance(exp, (int, float)):
+            raise jwt.JWTClaimsError("Expiration Time claim (exp) must be an integer.")
+        if exp <= now:
+            raise jwt.ExpiredSignatureError("Signature has expired.")
+    
+    return payload
 
 
 def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
@@ -85,7 +201,27 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
         Dict containing token payload if valid, None otherwise
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        with _token_cache_lock:
+            cached = _token_cache.get(cache_key)
+            if cached is not None:
+                _token_cache.move_to_end(cache_key)
+        
+        if cached is not None:
+            payload, token_exp = cached
+            if time.time() < token_exp:
+                if payload.get("type") != token_type:
+                    logger.warning(f"Token type mismatch: expected {token_type}, got {payload.get('type')}")
+                    return None
+                return dict(payload)
+            
+            with _token_cache_lock:
+                _token_cache.pop(cache_key, None)
+        
+        if ALGORITHM in _HMAC_DIGESTS:
+            payload = _decode_hs_token(token)
+        else:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         token_data = payload.get("sub")
         token_exp = payload.get("exp")
         payload_type = payload.get("type")
@@ -101,13 +237,13 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
         if payload_type != token_type:
             logger.warning(f"Token type mismatch: expected {token_type}, got {payload_type}")
             return None
+        
+        with _token_cache_lock:
+            _token_cache[cache_key] = (payload, float(token_exp))
+            if len(_token_cache) > TOKEN_CACHE_MAXSIZE:
+                _token_cache.popitem(last=False)
             
-        # Check if token is expired
-        if datetime.utcnow() > datetime.fromtimestamp(token_exp):
-            logger.warning("Token has expired")
-            return None
-            
-        return payload
+        return dict(payload)
         
     except jwt.ExpiredSignatureError:
         logger.warning("Token has expired")
@@ -132,7 +268,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         bool: True if password matches, False otherwise
     """
     try:
-        return pwd_context.verify(plain_password, hashed_password)
+        return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
     except Exception as e:
         logger.error(f"Error verifying password: {e}")
         return False
@@ -149,7 +285,9 @@ def get_password_hash(password: str) -> str:
         str: Hashed password
     """
     try:
-        return pwd_context.hash(password)
+        return bcrypt.hashpw(
+            password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+        ).decode("ascii")
     except Exception as e:
         logger.error(f"Error hashing password: {e}")
         raise
@@ -198,10 +336,8 @@ def generate_password_reset_token(email: str) -> str:
     Returns:
         str: Password reset token
     """
-    delta = timedelta(hours=1)  # Reset token expires in 1 hour
-    now = datetime.utcnow()
-    expires = now + delta
-    exp = expires.timestamp()
+    now = int(time.time())
+    exp = now + 3600  # Reset token expires in 1 hour
     encoded_jwt = jwt.encode(
         {"exp": exp, "nbf": now, "sub": email, "type": "password_reset"},
         SECRET_KEY,
@@ -240,12 +376,22 @@ security = HTTPBearer()
 
 
 def get_current_user(
+    request: Request,
     token: str = Depends(security),
     db: Session = Depends(get_db)
 ) -> "User":
-    """Get current authenticated user."""
+    """
+    Get current authenticated user.
+    
+    The user is stored on ``request.state.current_user`` so later lookups
+    within the same request reuse it instead of querying again.
+    """
     from app.models.user import User
     
+    current_user = getattr(request.state, "current_user", None)
+    if current_user is not None:
+        return current_user
+    
     payload = verify_token(token.credentials)
     if not payload:
         raise HTTPException(
@@ -275,6 +421,7 @@ def get_current_user(
                 detail="User account is inactive"
             )
         
+        request.state.current_user = user
         return user
     except Exception as e:
         logger.error(f"Error getting current user: {e}")
@@ -286,9 +433,7 @@ def get_current_user(
 
 def require_admin(current_user: "User" = Depends(get_current_user)) -> "User":
     """Require admin privileges."""
-    from app.models.enums import UserRole
-    
-    if current_user.role not in [UserRole.ADMIN, UserRole.SUPER_ADMIN, UserRole.PAYROLL_ADMIN]:
+    if not current_user.can_modify_payroll():
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin privileges required"
@@ -297,6 +442,17 @@ def require_admin(current_user: "User" = Depends(get_current_user)) -> "User":
     return current_user
 
 
+def require_user_admin(current_user: "User" = Depends(get_current_user)) -> "User":
+    """Require account-administration privileges (admin or super admin)."""
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return current_user
+
+
 def require_super_admin(current_user: "User" = Depends(get_current_user)) -> "User":
     """Require super admin privileges."""
     from app.models.enums import UserRole
@@ -13,33 +13,74 @@ from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-import time
+from sqlalchemy.exc import OperationalError
 import json
 
-from app.core.config import get_settings
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+from app.core.config import settings
 from app.core.database import init_db
-from app.core.cache import start_cleanup_task
+from app.core.cache import start_cleanup_task, stop_cleanup_task
+from app.core.clock import coarse_time, start_clock_task, stop_clock_task
 from app.api.v1.api import api_router
 from app.core.middleware import (
     RateLimitMiddleware,
     SecurityHeadersMiddleware,
+    RequestSizeLimitMiddleware,
     RequestValidationMiddleware,
     PerformanceMiddleware,
-    CacheControlMiddleware
+    CacheControlMiddleware,
+    FastPathMiddleware,
+    start_rate_limit_cleanup,
+    stop_rate_limit_cleanup,
 )
 from app.core.logging import RequestLoggingMiddleware, setup_logging
+from app.models.types import EncryptedStr
 
 # Configure logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
-# Get settings
-settings = get_settings()
+
+# Static response bodies, serialized once. The health body is left open
+# (closing brace stripped) so only the timestamp is encoded per probe.
+_HEALTH_PREFIX = json.dumps(
+    {
+        "status": "healthy",
+        "service": settings.APP_NAME,
+        "version": settings.APP_VERSION,
+        "environment": settings.ENVIRONMENT,
+    },
+    separators=(",", ":")
+).encode("utf-8")[:-1]
+
+_API_ROOT_BODY = json.dumps(
+    {
+        "message": "Payroll Management API",
+        "version": settings.APP_VERSION,
+        "docs_url": "/api/docs",
+        "redoc_url": "/api/redoc",
+        "openapi_url": "/api/openapi.json"
+    },
+    separators=(",", ":")
+).encode("utf-8")
+
+# Paths served by the health check and the docs, exempt from rate limiting
+HEALTH_PATHS = ("/", "/health")
+MONITORING_PATHS = HEALTH_PATHS + ("/api/docs", "/api/redoc", "/api/openapi.json")
+
+
+def render_health_body() -> bytes:
+    """Render the health check payload with the current timestamp."""
+    return _HEALTH_PREFIX + b',"timestamp":' + repr(coarse_time()).encode("ascii") + b"}"
 
 
 @asynccontextmanager
@@ -47,13 +88,22 @@ async def lifespan(app: FastAPI):
     """Application lifespan context manager."""
     # Startup
     logger.info("Starting up Payroll Management System...")
+    # Fail fast when FIELD_ENCRYPTION_KEY is missing or malformed
+    EncryptedStr.cipher()
     await init_db()
     logger.info("Database initialized successfully")
     
+    start_cleanup_task(interval=300)  # Clean up every 5 minutes
+    start_clock_task(interval=0.2)
+    start_rate_limit_cleanup()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Payroll Management System...")
+    await stop_cleanup_task()
+    await stop_clock_task()
+    await stop_rate_limit_cleanup()
 
 
 def create_app() -> FastAPI:
@@ -65,6 +115,7 @@ def create_app() -> FastAPI:
         docs_url="/api/docs",
         redoc_url="/api/redoc",
         openapi_url="/api/openapi.json",
+        default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
         lifespan=lifespan
     )
     
@@ -82,8 +133,13 @@ def create_app() -> FastAPI:
 
     # Security middleware
     app.add_middleware(SecurityHeadersMiddleware)
-    app.add_middleware(RequestValidationMiddleware, max_request_size=10 * 1024 * 1024)  # 10MB
-    app.add_middleware(RateLimitMiddleware, default_requests_per_minute=60, auth_requests_per_minute=10)
+    app.add_middleware(RequestValidationMiddleware)
+    app.add_middleware(
+        RateLimitMiddleware,
+        default_requests_per_minute=60,
+        auth_requests_per_minute=10,
+        exempt_paths=MONITORING_PATHS
+    )
 
     # Performance middleware
     app.add_middleware(PerformanceMiddleware, slow_request_threshold=2.0)
@@ -98,6 +154,13 @@ def create_app() -> FastAPI:
     # Trusted hosts middleware
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
     
+    # Request size limit (added last so it runs first, before any body is read)
+    app.add_middleware(RequestSizeLimitMiddleware, max_request_size=10 * 1024 * 1024)  # 10MB
+    
+    # Answer load-balancer health probes before the rest of the stack
+    if settings.FAST_HEALTH_CHECK:
+        app.add_middleware(FastPathMiddleware, routes={path: render_health_body for path in HEALTH_PATHS})
+    
     # Include API router
     app.include_router(api_router, prefix=settings.API_V1_STR)
     
@@ -117,7 +180,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
         content={
             "error": exc.detail,
             "status_code": exc.status_code,
-            "timestamp": time.time()
+            "timestamp": coarse_time()
         }
     )
 
@@ -131,21 +194,39 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "error": "Validation error",
             "details": exc.errors(),
             "status_code": 422,
-            "timestamp": time.time()
+            "timestamp": coarse_time()
         }
     )
 
 
+@app.exception_handler(OperationalError)
+async def operational_error_handler(request: Request, exc: OperationalError):
+    """Handle database errors, asking clients to retry on SQLite lock contention."""
+    if "database is locked" not in str(exc.orig):
+        return await general_exception_handler(request, exc)
+    
+    logger.warning(f"Database busy, request rejected: {request.method} {request.url.path}")
+    return JSONResponse(
+        status_code=503,
+        content={
+            "error": "Database busy, please retry",
+            "status_code": 503,
+            "timestamp": coarse_time()
+        },
+        headers={"Retry-After": "1"}
+    )
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions."""
-    logger.error(f"Unhandled exception: {exc}")
+    logger.error(f"Unhandled exception: {exc}", exc_info=exc)
     return JSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
             "status_code": 500,
-            "timestamp": time.time()
+            "timestamp": coarse_time()
         }
     )
 
@@ -155,40 +236,14 @@ async def general_exception_handler(request: Request, exc: Exception):
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "service": settings.APP_NAME,
-        "version": settings.APP_VERSION,
-        "environment": settings.ENVIRONMENT,
-        "timestamp": time.time()
-    }
+    return Response(content=render_health_body(), media_type="application/json")
 
 
 # Root redirect
 @app.get("/api", tags=["Root"])
 async def api_root():
     """API root endpoint."""
-    return {
-        "message": "Payroll Management API",
-        "version": settings.APP_VERSION,
-        "docs_url": "/api/docs",
-        "redoc_url": "/api/redoc",
-        "openapi_url": "/api/openapi.json"
-    }
-
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize application on startup."""
-    logger.info("Starting up Payroll Management System...")
-    
-    # Initialize database
-    await init_db()
-    logger.info("Database initialized successfully")
-    
-    # Start cache cleanup task
-    start_cleanup_task(interval=300)  # Clean up every 5 minutes
-    logger.info("Cache cleanup task started")
+    return Response(content=_API_ROOT_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -2,23 +2,76 @@
 Models package for the Payroll Management System.
 
 This package contains all SQLAlchemy models for the application.
+
+Names are loaded lazily (PEP 562): ``from app.models import User`` imports
+only ``app.models.user``. The remaining model modules are imported just
+before SQLAlchemy configures mappers, so string-based relationships
+always resolve.
 """
 
-from app.models.user import User
-from app.models.employee import Employee
-from app.models.payroll import PayrollRecord, PayPeriod
-from app.models.time_entry import TimeEntry
-from app.models.enums import (
-    UserRole, UserStatus, EmployeeStatus, EmploymentType, 
-    PayrollFrequency, PayrollStatus, PayrollType, BenefitType,
-    DeductionType, EarningType, TaxType, ReportType, AuditAction,
-    LeaveType, LeaveStatus, TimesheetStatus, TimeEntryStatus,
-    TimeEntryType, ApprovalStatus, ReportFormat, ReportPeriod, ReportStatus
+import importlib
+
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
+
+# Model modules, in the order their tables are declared
+_MODEL_MODULES = (
+    "app.models.user",
+    "app.models.employee",
+    "app.models.payroll",
+    "app.models.time_entry",
 )
 
+# Public name -> defining module
+_LAZY = {
+    "User": "app.models.user",
+    "Employee": "app.models.employee",
+    "PayrollRecord": "app.models.payroll",
+    "PayPeriod": "app.models.payroll",
+    "TimeEntry": "app.models.time_entry",
+    **{
+        name: "app.models.enums"
+        for name in (
+            "UserRole", "UserStatus", "EmployeeStatus", "EmploymentType",
+            "PayrollFrequency", "PayrollStatus", "PayrollType", "BenefitType", "BenefitFlag",
+            "DeductionType", "EarningType", "TaxType", "ReportType", "AuditAction",
+            "LeaveType", "LeaveStatus", "TimesheetStatus", "TimeEntryStatus",
+            "TimeEntryType", "ApprovalStatus", "ReportFormat", "ReportPeriod", "ReportStatus",
+        )
+    },
+}
+
+
+def __getattr__(name: str):
+    """Import a model or enum on first access and cache it on the package."""
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+def load_all_models() -> None:
+    """Import every model module so all mappers and tables are registered."""
+    for module_name in _MODEL_MODULES:
+        importlib.import_module(module_name)
+
+
+@event.listens_for(Mapper, "before_configured")
+def _load_models_before_configure() -> None:
+    """Register all models before relationships are resolved."""
+    load_all_models()
+
+
 __all__ = [
     "User",
-    "Employee", 
+    "Employee",
     "PayrollRecord",
     "PayPeriod",
     "TimeEntry",
@@ -30,6 +83,7 @@ __all__ = [
     "PayrollStatus",
     "PayrollType",
     "BenefitType",
+    "BenefitFlag",
     "DeductionType",
     "EarningType",
     "TaxType",
@@ -43,5 +97,6 @@ __all__ = [
     "ApprovalStatus",
     "ReportFormat",
     "ReportPeriod",
-    "ReportStatus"
-] 
\ No newline at end of file
+    "ReportStatus",
+    "load_all_models",
+]
@@ -7,19 +7,93 @@ compensation, benefits, and payroll-related data.
 
 from datetime import datetime, date
 from decimal import Decimal
-from typing import Optional
+from functools import cached_property
+from typing import Callable, Optional
 
 from sqlalchemy import (
     Boolean, Column, Date, DateTime, Enum, ForeignKey, Integer, 
-    Numeric, String, Text, UniqueConstraint, Index
+    Numeric, SmallInteger, String, Text, Index, case, event, false, func, text
 )
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.sql.functions import FunctionElement
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.models.types import EncryptedStr, MoneyCents
 from app.models.enums import (
-    EmployeeStatus, EmploymentType, PayrollFrequency
+    BenefitFlag, EmployeeStatus, EmploymentType, PayrollFrequency
 )
 
+# Pay periods per year for each payroll frequency
+_FREQ_DIVISORS = {
+    PayrollFrequency.WEEKLY: Decimal(52),
+    PayrollFrequency.BIWEEKLY: Decimal(26),
+    PayrollFrequency.SEMI_MONTHLY: Decimal(24),
+    PayrollFrequency.MONTHLY: Decimal(12),
+}
+_NO_DIVISOR = Decimal(1)
+_ZERO = Decimal('0.00')
+_DEFAULT_OVERTIME_RATE = Decimal('1.5')
+
+# Employment types that qualify for benefits
+_BENEFIT_ELIGIBLE_TYPES = frozenset({EmploymentType.FULL_TIME, EmploymentType.PART_TIME})
+
+
+def _as_decimal(value) -> Decimal:
+    """Return ``value`` as a Decimal, converting through ``str`` only if needed."""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+class _days_between(FunctionElement):
+    """Whole days from the second date to the first, as an integer."""
+    
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(_days_between)
+def _compile_days_between(element, compiler, **kw):
+    # PostgreSQL: date - date is an integer number of days
+    end, start = list(element.clauses)
+    return f"({compiler.process(end, **kw)} - {compiler.process(start, **kw)})"
+
+
+@compiles(_days_between, "sqlite")
+def _compile_days_between_sqlite(element, compiler, **kw):
+    end, start = list(element.clauses)
+    return (
+        f"CAST(julianday({compiler.process(end, **kw)}) - "
+        f"julianday({compiler.process(start, **kw)}) AS INTEGER)"
+    )
+
+
+def _days_remaining(allowance: str, used: str) -> hybrid_property:
+    """Remaining days of a leave allowance, never below zero, usable in queries."""
+    def fget(self) -> int:
+        return max(0, getattr(self, allowance) - getattr(self, used))
+    
+    def expr(cls):
+        remaining = getattr(cls, allowance) - getattr(cls, used)
+        return case((remaining > 0, remaining), else_=0)
+    
+    return hybrid_property(fget, expr=expr)
+
+
+def _benefit_flag(flag: BenefitFlag) -> hybrid_property:
+    """Boolean view of one bit of ``Employee.benefits_mask``, usable in queries."""
+    def fget(self) -> bool:
+        return bool((self.benefits_mask or 0) & flag)
+    
+    def fset(self, value: bool) -> None:
+        mask = self.benefits_mask or 0
+        self.benefits_mask = mask | flag if value else mask & ~flag
+    
+    def expr(cls):
+        return cls.benefits_mask.op("&")(int(flag)) != 0
+    
+    return hybrid_property(fget, fset, expr=expr)
+
 
 class Employee(Base):
     """Employee model for payroll management."""
@@ -58,47 +132,48 @@ class Employee(Base):
     manager_id = Column(Integer, ForeignKey("employees.id"), nullable=True)
     
     # Compensation Information
-    salary = Column(Numeric(10, 2), nullable=True)  # Annual salary
-    hourly_rate = Column(Numeric(10, 2), nullable=True)  # Hourly rate
+    salary = Column(MoneyCents, nullable=True)  # Annual salary
+    hourly_rate = Column(MoneyCents, nullable=True)  # Hourly rate
     payroll_frequency = Column(Enum(PayrollFrequency), default=PayrollFrequency.BIWEEKLY)
     overtime_rate = Column(Numeric(10, 2), nullable=True)  # Overtime multiplier
     
     # Tax Information
-    ssn = Column(String(11), nullable=True)  # Encrypted
+    ssn = Column(EncryptedStr(255), nullable=True)
     tax_id = Column(String(20), nullable=True)  # Alternative to SSN
-    federal_allowances = Column(Integer, default=0)
-    state_allowances = Column(Integer, default=0)
-    additional_federal_withholding = Column(Numeric(10, 2), default=0)
-    additional_state_withholding = Column(Numeric(10, 2), default=0)
-    
-    # Benefits Information
-    health_insurance = Column(Boolean, default=False)
-    dental_insurance = Column(Boolean, default=False)
-    vision_insurance = Column(Boolean, default=False)
-    life_insurance = Column(Boolean, default=False)
-    disability_insurance = Column(Boolean, default=False)
-    retirement_401k = Column(Boolean, default=False)
-    retirement_401k_percent = Column(Numeric(5, 2), default=0)
-    retirement_401k_match = Column(Numeric(5, 2), default=0)
+    federal_allowances = Column(Integer, server_default=text('0'))
+    state_allowances = Column(Integer, server_default=text('0'))
+    additional_federal_withholding = Column(MoneyCents, server_default=text('0'))
+    additional_state_withholding = Column(MoneyCents, server_default=text('0'))
+    
+    # Benefits Information: enrollments packed into one BenefitFlag bitmask
+    benefits_mask = Column(SmallInteger, server_default=text('0'), nullable=False)
+    health_insurance = _benefit_flag(BenefitFlag.HEALTH)
+    dental_insurance = _benefit_flag(BenefitFlag.DENTAL)
+    vision_insurance = _benefit_flag(BenefitFlag.VISION)
+    life_insurance = _benefit_flag(BenefitFlag.LIFE)
+    disability_insurance = _benefit_flag(BenefitFlag.DISABILITY)
+    retirement_401k = _benefit_flag(BenefitFlag.RETIREMENT)
+    retirement_401k_percent = Column(Numeric(5, 2), server_default=text('0'))
+    retirement_401k_match = Column(Numeric(5, 2), server_default=text('0'))
     
     # PTO Information
-    vacation_days_per_year = Column(Integer, default=0)
-    sick_days_per_year = Column(Integer, default=0)
-    personal_days_per_year = Column(Integer, default=0)
-    vacation_days_used = Column(Integer, default=0)
-    sick_days_used = Column(Integer, default=0)
-    personal_days_used = Column(Integer, default=0)
+    vacation_days_per_year = Column(Integer, server_default=text('0'))
+    sick_days_per_year = Column(Integer, server_default=text('0'))
+    personal_days_per_year = Column(Integer, server_default=text('0'))
+    vacation_days_used = Column(Integer, server_default=text('0'))
+    sick_days_used = Column(Integer, server_default=text('0'))
+    personal_days_used = Column(Integer, server_default=text('0'))
     
     # Banking Information (Encrypted)
     bank_name = Column(String(100), nullable=True)
-    bank_routing_number = Column(String(20), nullable=True)
-    bank_account_number = Column(String(30), nullable=True)
+    bank_routing_number = Column(EncryptedStr(255), nullable=True)
+    bank_account_number = Column(EncryptedStr(255), nullable=True)
     bank_account_type = Column(String(20), nullable=True)  # checking, savings
     
     # Compliance Information
-    i9_completed = Column(Boolean, default=False)
-    w4_completed = Column(Boolean, default=False)
-    background_check_completed = Column(Boolean, default=False)
+    i9_completed = Column(Boolean, server_default=false())
+    w4_completed = Column(Boolean, server_default=false())
+    background_check_completed = Column(Boolean, server_default=false())
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -110,7 +185,7 @@ class Employee(Base):
     
     # Relationships
     user = relationship("User", back_populates="employee")
-    manager = relationship("Employee", remote_side=[id])
+    manager = relationship("Employee", remote_side=[id], lazy="selectin")
     subordinates = relationship("Employee", back_populates="manager")
     payroll_records = relationship("PayrollRecord", back_populates="employee")
     time_entries = relationship("TimeEntry", foreign_keys="TimeEntry.employee_id", back_populates="employee")
@@ -119,12 +194,14 @@ class Employee(Base):
     # leave_requests = relationship("LeaveRequest", back_populates="employee")
     # benefits = relationship("EmployeeBenefit", back_populates="employee")
     
+    # Column defaults come from the database; fetch them back in the INSERT
+    # (RETURNING) instead of a follow-up SELECT on first access
+    __mapper_args__ = {"eager_defaults": True}
+    
     # Constraints and Indexes for Performance
     __table_args__ = (
-        UniqueConstraint("employee_id", name="uq_employee_id"),
-        # Performance indexes based on common query patterns
-        Index('idx_employee_department', 'department'),
-        Index('idx_employee_status', 'status'),
+        # Performance indexes based on common query patterns; status and
+        # department lookups use the composites below, which lead with them
         Index('idx_employee_employment_type', 'employment_type'),
         Index('idx_employee_hire_date', 'hire_date'),
         Index('idx_employee_manager_id', 'manager_id'),
@@ -141,14 +218,14 @@ class Employee(Base):
     def __repr__(self) -> str:
         return f"<Employee(id={self.id}, employee_id='{self.employee_id}', name='{self.full_name}')>"
     
-    @property
+    @cached_property
     def full_name(self) -> str:
         """Get the employee's full name."""
         if self.middle_name:
             return f"{self.first_name} {self.middle_name} {self.last_name}"
         return f"{self.first_name} {self.last_name}"
     
-    @property
+    @cached_property
     def display_name(self) -> str:
         """Get the employee's display name (preferred or full name)."""
         return self.preferred_name or self.full_name
@@ -179,7 +256,7 @@ class Employee(Base):
         # This would require a birth_date field to implement
         return None
     
-    @property
+    @hybrid_property
     def years_of_service(self) -> int:
         """Calculate years of service."""
         if self.hire_date:
@@ -187,65 +264,96 @@ class Employee(Base):
             return (end_date - self.hire_date).days // 365
         return 0
     
-    @property
-    def vacation_days_remaining(self) -> int:
-        """Calculate remaining vacation days."""
-        return max(0, self.vacation_days_per_year - self.vacation_days_used)
-    
-    @property
-    def sick_days_remaining(self) -> int:
-        """Calculate remaining sick days."""
-        return max(0, self.sick_days_per_year - self.sick_days_used)
+    @years_of_service.expression
+    def years_of_service(cls):
+        """SQL form of ``years_of_service`` for server-side filtering and sorting."""
+        end_date = func.coalesce(cls.termination_date, date.today())
+        return case(
+            (cls.hire_date.is_(None), 0),
+            else_=_days_between(end_date, cls.hire_date).op("/")(365)
+        )
     
-    @property
-    def personal_days_remaining(self) -> int:
-        """Calculate remaining personal days."""
-        return max(0, self.personal_days_per_year - self.personal_days_used)
+    # Remaining leave, also available as SQL expressions
+    vacation_days_remaining = _days_remaining("vacation_days_per_year", "vacation_days_used")
+    sick_days_remaining = _days_remaining("sick_days_per_year", "sick_days_used")
+    personal_days_remaining = _days_remaining("personal_days_per_year", "personal_days_used")
     
-    def calculate_gross_pay(self, hours_worked: float = 0, pay_periods: int = 1) -> Decimal:
-        """Calculate gross pay based on salary or hourly rate."""
+    @cached_property
+    def _gross_pay_fn(self) -> Callable[[float, int], Decimal]:
+        """
+        Gross pay calculation specialized for this employee's pay setup.
+        
+        The salaried/hourly branch and frequency lookup are resolved once and
+        cached until salary, hourly rate or payroll frequency change.
+        """
         if self.is_salaried:
-            # Calculate salary per pay period
-            if self.payroll_frequency == PayrollFrequency.WEEKLY:
-                return Decimal(str(self.salary)) / 52 * pay_periods
-            elif self.payroll_frequency == PayrollFrequency.BIWEEKLY:
-                return Decimal(str(self.salary)) / 26 * pay_periods
-            elif self.payroll_frequency == PayrollFrequency.SEMI_MONTHLY:
-                return Decimal(str(self.salary)) / 24 * pay_periods
-            elif self.payroll_frequency == PayrollFrequency.MONTHLY:
-                return Decimal(str(self.salary)) / 12 * pay_periods
-            else:
-                return Decimal(str(self.salary)) * pay_periods
+            # Salary per pay period
+            per_period = _as_decimal(self.salary) / _FREQ_DIVISORS.get(self.payroll_frequency, _NO_DIVISOR)
+            return lambda hours_worked, pay_periods: per_period * pay_periods
         
-        elif self.is_hourly:
-            return Decimal(str(self.hourly_rate)) * Decimal(str(hours_worked))
+        if self.is_hourly:
+            rate = _as_decimal(self.hourly_rate)
+            return lambda hours_worked, pay_periods: rate * _as_decimal(hours_worked)
         
-        return Decimal('0.00')
+        return lambda hours_worked, pay_periods: _ZERO
+    
+    def calculate_gross_pay(self, hours_worked: float = 0, pay_periods: int = 1) -> Decimal:
+        """Calculate gross pay based on salary or hourly rate."""
+        return self._gross_pay_fn(hours_worked, pay_periods)
     
     def calculate_overtime_pay(self, overtime_hours: float) -> Decimal:
         """Calculate overtime pay."""
         if self.is_hourly and self.hourly_rate and overtime_hours > 0:
-            overtime_rate = self.overtime_rate or Decimal('1.5')
-            return Decimal(str(self.hourly_rate)) * overtime_rate * Decimal(str(overtime_hours))
-        return Decimal('0.00')
+            overtime_rate = self.overtime_rate or _DEFAULT_OVERTIME_RATE
+            return _as_decimal(self.hourly_rate) * overtime_rate * _as_decimal(overtime_hours)
+        return _ZERO
     
     def is_eligible_for_benefits(self) -> bool:
         """Check if employee is eligible for benefits."""
         # Basic eligibility check - can be extended with more complex rules
         return (
             self.is_active and
-            self.employment_type in [EmploymentType.FULL_TIME, EmploymentType.PART_TIME] and
+            self.employment_type in _BENEFIT_ELIGIBLE_TYPES and
             self.years_of_service >= 0  # Immediate eligibility, can be modified
         )
     
+    @cached_property
+    def full_address(self) -> str:
+        """Get formatted full address."""
+        return ", ".join([
+            part for part in (
+                self.address_line1,
+                self.address_line2,
+                self.city,
+                self.state,
+                self.postal_code,
+                self.country
+            ) if part
+        ])
+    
     def get_full_address(self) -> str:
         """Get formatted full address."""
-        parts = [
-            self.address_line1,
-            self.address_line2,
-            self.city,
-            self.state,
-            self.postal_code,
-            self.country
-        ]
-        return ", ".join(filter(None, parts)) 
\ No newline at end of file
+        return self.full_address
+
+
+# Formatted name and address and the specialized gross pay calculation are
+# cached on the instance; drop them whenever their source columns change or
+# are reloaded so they never go stale
+_CACHED_ATTRS = ("full_name", "display_name", "full_address", "_gross_pay_fn")
+_CACHED_SOURCE_COLUMNS = (
+    "first_name", "middle_name", "last_name", "preferred_name",
+    "address_line1", "address_line2", "city", "state", "postal_code", "country",
+    "salary", "hourly_rate", "payroll_frequency",
+)
+
+
+def _clear_cached_attrs(target, *args) -> None:
+    """Forget the cached derived properties of an employee."""
+    for attr in _CACHED_ATTRS:
+        target.__dict__.pop(attr, None)
+
+
+event.listen(Employee, "refresh", _clear_cached_attrs)
+event.listen(Employee, "expire", _clear_cached_attrs)
+for _column in _CACHED_SOURCE_COLUMNS:
+    event.listen(getattr(Employee, _column), "set", _clear_cached_attrs)
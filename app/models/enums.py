@@ -5,7 +5,7 @@ This module defines all enum types used across the application
 for consistent data validation and type safety.
 """
 
-from enum import Enum
+from enum import Enum, IntFlag
 
 
 class UserRole(str, Enum):
@@ -107,6 +107,17 @@ class BenefitType(str, Enum):
     OTHER = "other"
 
 
+class BenefitFlag(IntFlag):
+    """Benefit enrollment bits packed into ``Employee.benefits_mask``."""
+    
+    HEALTH = 1
+    DENTAL = 2
+    VISION = 4
+    LIFE = 8
+    DISABILITY = 16
+    RETIREMENT = 32
+
+
 class DeductionType(str, Enum):
     """Payroll deduction types."""
     
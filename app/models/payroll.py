@@ -5,17 +5,19 @@ This module defines the PayrollRecord and PayPeriod models for handling
 payroll calculations, pay periods, and payroll history.
 """
 
-from datetime import datetime, date
+from datetime import date
 from decimal import Decimal
 from typing import Optional
 
 from sqlalchemy import (
-    Boolean, Column, Date, DateTime, ForeignKey, Integer, 
-    Numeric, String, Text, Enum, Index
+    Boolean, Column, Computed, Date, DateTime, ForeignKey, Integer, 
+    Numeric, String, Text, Enum, Index, and_, false, func, text
 )
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.models.types import MoneyCents
 from app.models.enums import PayrollFrequency, PayrollStatus
 
 
@@ -30,16 +32,20 @@ class PayPeriod(Base):
     pay_date = Column(Date, nullable=False)
     frequency = Column(Enum(PayrollFrequency), nullable=False)
     description = Column(String(255), nullable=True)
-    is_holiday_period = Column(Boolean, default=False)
-    is_processed = Column(Boolean, default=False)
+    is_holiday_period = Column(Boolean, server_default=false())
+    is_processed = Column(Boolean, server_default=false())
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
     payroll_records = relationship("PayrollRecord", back_populates="pay_period")
     
+    # Timestamps and zero defaults come from the database; fetch them back in
+    # the INSERT/UPDATE (RETURNING) instead of a follow-up SELECT on first access
+    __mapper_args__ = {"eager_defaults": True}
+    
     # Performance indexes
     __table_args__ = (
         Index('idx_pay_period_dates', 'start_date', 'end_date'),
@@ -47,11 +53,17 @@ class PayPeriod(Base):
         Index('idx_pay_period_end_date', 'end_date'),
         Index('idx_pay_period_pay_date', 'pay_date'),
         Index('idx_pay_period_frequency', 'frequency'),
-        Index('idx_pay_period_is_processed', 'is_processed'),
         Index('idx_pay_period_created_at', 'created_at'),
-        # Composite indexes for common queries
-        Index('idx_pay_period_active_dates', 'start_date', 'end_date', 'is_processed'),
+        # Composite indexes for common queries; the low-cardinality flag
+        # leads so "unprocessed periods covering a date" seeks, then ranges
+        Index('idx_pay_period_active_dates', 'is_processed', 'start_date', 'end_date'),
         Index('idx_pay_period_frequency_processed', 'frequency', 'is_processed'),
+        # Partial index over the small set of open periods
+        Index(
+            'idx_pay_period_unprocessed', 'start_date', 'end_date',
+            postgresql_where=text('is_processed = false'),
+            sqlite_where=text('is_processed = 0'),
+        ),
     )
     
     def __repr__(self) -> str:
@@ -62,11 +74,29 @@ class PayPeriod(Base):
         """Calculate the number of days in the pay period."""
         return (self.end_date - self.start_date).days + 1
     
-    @property
+    @hybrid_property
     def is_current_period(self) -> bool:
         """Check if this is the current pay period."""
         today = date.today()
         return self.start_date <= today <= self.end_date
+    
+    @is_current_period.expression
+    def is_current_period(cls):
+        """SQL form of ``is_current_period``, served by the date indexes."""
+        today = date.today()
+        return and_(cls.start_date <= today, cls.end_date >= today)
+
+
+# Payroll statuses still being worked on. Enum columns store member names.
+ACTIVE_PAYROLL_STATUSES = (
+    PayrollStatus.DRAFT,
+    PayrollStatus.CALCULATING,
+    PayrollStatus.REVIEW,
+    PayrollStatus.APPROVED,
+)
+_ACTIVE_STATUS_FILTER = text(
+    "status IN ({})".format(", ".join(f"'{status.name}'" for status in ACTIVE_PAYROLL_STATUSES))
+)
 
 
 class PayrollRecord(Base):
@@ -79,28 +109,43 @@ class PayrollRecord(Base):
     pay_period_id = Column(Integer, ForeignKey("pay_periods.id"), nullable=False)
     
     # Pay Information
-    hours_worked = Column(Numeric(8, 2), default=0)
-    overtime_hours = Column(Numeric(8, 2), default=0)
-    gross_pay = Column(Numeric(10, 2), nullable=False)
-    net_pay = Column(Numeric(10, 2), nullable=False)
+    hours_worked = Column(Numeric(8, 2), server_default=text('0'))
+    overtime_hours = Column(Numeric(8, 2), server_default=text('0'))
+    gross_pay = Column(MoneyCents, nullable=False)
+    net_pay = Column(MoneyCents, nullable=False)
     
     # Tax Deductions
-    federal_income_tax = Column(Numeric(10, 2), default=0)
-    state_income_tax = Column(Numeric(10, 2), default=0)
-    social_security_tax = Column(Numeric(10, 2), default=0)
-    medicare_tax = Column(Numeric(10, 2), default=0)
+    federal_income_tax = Column(MoneyCents, server_default=text('0'))
+    state_income_tax = Column(MoneyCents, server_default=text('0'))
+    social_security_tax = Column(MoneyCents, server_default=text('0'))
+    medicare_tax = Column(MoneyCents, server_default=text('0'))
+    tax_deductions_total = Column(
+        MoneyCents,
+        Computed(
+            "federal_income_tax + state_income_tax + social_security_tax + medicare_tax",
+            persisted=True
+        )
+    )
     
     # Benefit Deductions
-    health_insurance = Column(Numeric(10, 2), default=0)
-    dental_insurance = Column(Numeric(10, 2), default=0)
-    vision_insurance = Column(Numeric(10, 2), default=0)
-    life_insurance = Column(Numeric(10, 2), default=0)
-    disability_insurance = Column(Numeric(10, 2), default=0)
-    retirement_401k = Column(Numeric(10, 2), default=0)
+    health_insurance = Column(MoneyCents, server_default=text('0'))
+    dental_insurance = Column(MoneyCents, server_default=text('0'))
+    vision_insurance = Column(MoneyCents, server_default=text('0'))
+    life_insurance = Column(MoneyCents, server_default=text('0'))
+    disability_insurance = Column(MoneyCents, server_default=text('0'))
+    retirement_401k = Column(MoneyCents, server_default=text('0'))
+    benefit_deductions_total = Column(
+        MoneyCents,
+        Computed(
+            "health_insurance + dental_insurance + vision_insurance + life_insurance"
+            " + disability_insurance + retirement_401k",
+            persisted=True
+        )
+    )
     
     # Other Deductions
-    other_deductions = Column(Numeric(10, 2), default=0)
-    total_deductions = Column(Numeric(10, 2), nullable=False)
+    other_deductions = Column(MoneyCents, server_default=text('0'))
+    total_deductions = Column(MoneyCents, nullable=False)
     
     # Status and Processing
     status = Column(Enum(PayrollStatus), default=PayrollStatus.DRAFT)
@@ -108,36 +153,53 @@ class PayrollRecord(Base):
     processed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     
     # Banking Information
-    direct_deposit_amount = Column(Numeric(10, 2), nullable=True)
+    direct_deposit_amount = Column(MoneyCents, nullable=True)
     check_number = Column(String(20), nullable=True)
     
     # Notes and Comments
     notes = Column(Text, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    employee = relationship("Employee", back_populates="payroll_records")
-    pay_period = relationship("PayPeriod", back_populates="payroll_records")
+    # Serializers and reports read these on every record: batch-load them
+    employee = relationship("Employee", back_populates="payroll_records", lazy="selectin")
+    pay_period = relationship("PayPeriod", back_populates="payroll_records", lazy="selectin")
     processed_by_user = relationship("User", foreign_keys=[processed_by])
     
+    # Timestamps and zero defaults come from the database; fetch them back in
+    # the INSERT/UPDATE (RETURNING) instead of a follow-up SELECT on first access
+    __mapper_args__ = {"eager_defaults": True}
+    
     # Performance indexes
     __table_args__ = (
         Index('idx_payroll_employee_id', 'employee_id'),
         Index('idx_payroll_pay_period_id', 'pay_period_id'),
-        Index('idx_payroll_status', 'status'),
         Index('idx_payroll_processed_at', 'processed_at'),
         Index('idx_payroll_processed_by', 'processed_by'),
         Index('idx_payroll_created_at', 'created_at'),
         Index('idx_payroll_updated_at', 'updated_at'),
-        # Composite indexes for common queries
-        Index('idx_payroll_employee_period', 'employee_id', 'pay_period_id'),
-        Index('idx_payroll_employee_status', 'employee_id', 'status'),
+        # Composite indexes for common queries; the payroll history lists
+        # read their projected columns from the index (PostgreSQL INCLUDE)
+        Index(
+            'idx_payroll_employee_period', 'employee_id', 'pay_period_id',
+            postgresql_include=['gross_pay', 'net_pay', 'status'],
+        ),
+        Index(
+            'idx_payroll_employee_status', 'employee_id', 'status',
+            postgresql_include=['gross_pay', 'net_pay', 'processed_at'],
+        ),
         Index('idx_payroll_period_status', 'pay_period_id', 'status'),
         Index('idx_payroll_employee_processed', 'employee_id', 'processed_at'),
         Index('idx_payroll_status_processed', 'status', 'processed_at'),
+        # Partial index over the in-flight work queue only
+        Index(
+            'idx_payroll_active_status', 'status', 'pay_period_id',
+            postgresql_where=_ACTIVE_STATUS_FILTER,
+            sqlite_where=_ACTIVE_STATUS_FILTER,
+        ),
     )
     
     def __repr__(self) -> str:
@@ -160,28 +222,6 @@ class PayrollRecord(Base):
             return self.gross_pay / self.hours_worked
         return None
     
-    @property
-    def tax_deductions_total(self) -> Decimal:
-        """Calculate total tax deductions."""
-        return (
-            self.federal_income_tax + 
-            self.state_income_tax + 
-            self.social_security_tax + 
-            self.medicare_tax
-        )
-    
-    @property
-    def benefit_deductions_total(self) -> Decimal:
-        """Calculate total benefit deductions."""
-        return (
-            self.health_insurance + 
-            self.dental_insurance + 
-            self.vision_insurance + 
-            self.life_insurance + 
-            self.disability_insurance + 
-            self.retirement_401k
-        )
-    
     @property
     def take_home_percentage(self) -> Decimal:
         """Calculate take-home pay percentage."""
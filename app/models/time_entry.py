@@ -7,25 +7,66 @@ including clock in/out, break times, overtime calculations, and approval workflo
 
 from datetime import datetime, date, time
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from sqlalchemy import (
     Boolean, Column, Date, DateTime, Enum, ForeignKey, Integer, 
-    Numeric, String, Text, Time, Index
+    Numeric, SmallInteger, String, Text, Time, Index, and_, false, or_
 )
+from sqlalchemy.ext.hybrid import hybrid_method, hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
 from app.models.enums import TimeEntryStatus, TimeEntryType, ApprovalStatus
 
+_SIXTY = Decimal(60)
+_HUNDREDTH = Decimal("0.01")
+
+# Standard assumption: 8 hours regular, overtime up to 12, double time after
+_REGULAR_MINUTES_LIMIT = 8 * 60
+_OVERTIME_MINUTES_LIMIT = 12 * 60
+
+
+def _minutes_between(start: datetime, end: datetime) -> int:
+    """Whole minutes from ``start`` to ``end``."""
+    return int((end - start).total_seconds() // 60)
+
+
+def _hours_to_minutes(hours) -> int:
+    """Convert a duration in hours to whole minutes."""
+    if not isinstance(hours, Decimal):
+        hours = Decimal(str(hours))
+    return int((hours * _SIXTY).to_integral_value())
+
+
+def minutes_to_hours(minutes: Optional[int]) -> Optional[Decimal]:
+    """Convert whole minutes to hours with two decimal places."""
+    if minutes is None:
+        return None
+    return (Decimal(minutes) / _SIXTY).quantize(_HUNDREDTH)
+
+
+def _hours_view(minutes_column: str) -> hybrid_property:
+    """Hours view of an integer minutes column, usable in queries."""
+    def fget(self) -> Optional[Decimal]:
+        return minutes_to_hours(getattr(self, minutes_column))
+    
+    def fset(self, value) -> None:
+        setattr(self, minutes_column, None if value is None else _hours_to_minutes(value))
+    
+    def expr(cls):
+        return getattr(cls, minutes_column) / 60
+    
+    return hybrid_property(fget, fset, expr=expr)
+
 
 class TimeEntry(Base):
     """Time entry model for employee time tracking."""
     
     __tablename__ = "time_entries"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
     
     # Date and Time Information
@@ -39,13 +80,21 @@ class TimeEntry(Base):
     lunch_start_time = Column(DateTime, nullable=True)
     lunch_end_time = Column(DateTime, nullable=True)
     
-    # Calculated Time Fields
-    total_hours = Column(Numeric(8, 2), nullable=True)
-    regular_hours = Column(Numeric(8, 2), nullable=True)
-    overtime_hours = Column(Numeric(8, 2), nullable=True)
-    double_time_hours = Column(Numeric(8, 2), nullable=True)
-    break_duration = Column(Numeric(8, 2), nullable=True)  # In hours
-    lunch_duration = Column(Numeric(8, 2), nullable=True)  # In hours
+    # Calculated Time Fields, stored as whole minutes
+    total_minutes = Column(SmallInteger, nullable=True)
+    regular_minutes = Column(SmallInteger, nullable=True)
+    overtime_minutes = Column(SmallInteger, nullable=True)
+    double_time_minutes = Column(SmallInteger, nullable=True)
+    break_minutes = Column(SmallInteger, nullable=True)
+    lunch_minutes = Column(SmallInteger, nullable=True)
+    
+    # Hour views of the calculated fields
+    total_hours = _hours_view("total_minutes")
+    regular_hours = _hours_view("regular_minutes")
+    overtime_hours = _hours_view("overtime_minutes")
+    double_time_hours = _hours_view("double_time_minutes")
+    break_duration = _hours_view("break_minutes")
+    lunch_duration = _hours_view("lunch_minutes")
     
     # Entry Information
     entry_type = Column(Enum(TimeEntryType), default=TimeEntryType.REGULAR)
@@ -58,7 +107,7 @@ class TimeEntry(Base):
     rejection_reason = Column(Text, nullable=True)
     
     # Manual Entry Fields
-    is_manual_entry = Column(Boolean, default=False)
+    is_manual_entry = Column(Boolean, server_default=false())
     manual_entry_reason = Column(Text, nullable=True)
     
     # Adjustment Fields
@@ -86,6 +135,10 @@ class TimeEntry(Base):
     approver = relationship("Employee", foreign_keys=[approved_by], back_populates="approved_time_entries")
     adjuster = relationship("Employee", foreign_keys=[adjusted_by], back_populates="adjusted_time_entries")
     
+    # Column defaults come from the database; fetch them back in the INSERT
+    # (RETURNING) instead of a follow-up SELECT on first access
+    __mapper_args__ = {"eager_defaults": True}
+    
     # Indexes for performance
     __table_args__ = (
         Index('idx_time_entries_employee_date', 'employee_id', 'work_date'),
@@ -102,11 +155,19 @@ class TimeEntry(Base):
         """Check if employee is currently clocked in."""
         return self.clock_in_time is not None and self.clock_out_time is None
     
-    @property
+    @hybrid_property
     def is_on_break(self) -> bool:
         """Check if employee is currently on break."""
-        return (self.break_start_time is not None and self.break_end_time is None) or \
-               (self.lunch_start_time is not None and self.lunch_end_time is None)
+        if self.break_start_time is not None and self.break_end_time is None:
+            return True
+        return self.lunch_start_time is not None and self.lunch_end_time is None
+    
+    @is_on_break.expression
+    def is_on_break(cls):
+        return or_(
+            and_(cls.break_start_time.is_not(None), cls.break_end_time.is_(None)),
+            and_(cls.lunch_start_time.is_not(None), cls.lunch_end_time.is_(None)),
+        )
     
     @property
     def is_complete(self) -> bool:
@@ -119,68 +180,84 @@ class TimeEntry(Base):
         if not self.is_complete:
             return 0
         
-        total_minutes = int((self.clock_out_time - self.clock_in_time).total_seconds() / 60)
-        
-        # Subtract break time
-        if self.break_duration:
-            total_minutes -= int(float(self.break_duration) * 60)
+        total_minutes = _minutes_between(self.clock_in_time, self.clock_out_time)
         
-        # Subtract lunch time
-        if self.lunch_duration:
-            total_minutes -= int(float(self.lunch_duration) * 60)
+        # Subtract break time (break_minutes already includes lunch)
+        if self.break_minutes:
+            total_minutes -= self.break_minutes
         
         return max(0, total_minutes)
     
-    @property
+    @hybrid_property
     def worked_duration_hours(self) -> Decimal:
-        """Calculate total worked duration in hours."""
-        return Decimal(str(self.worked_duration_minutes / 60))
+        """Worked duration in hours from the stored total; 0 until hours are calculated."""
+        return minutes_to_hours(self.total_minutes or 0)
+    
+    @worked_duration_hours.expression
+    def worked_duration_hours(cls):
+        # Same stored-total-only rule as the instance side
+        return func.coalesce(cls.total_hours, 0)
     
     def calculate_hours(self) -> None:
         """Calculate and update hour fields based on clock times."""
         if not self.is_complete:
             return
         
-        # Calculate total worked hours
-        total_worked = self.worked_duration_hours
-        
-        # Determine regular vs overtime hours
-        # Standard assumption: 8 hours regular, anything over is overtime
-        regular_hours_limit = Decimal('8.0')
-        overtime_hours_limit = Decimal('12.0')  # Double time after 12 hours
-        
-        if total_worked <= regular_hours_limit:
-            self.regular_hours = total_worked
-            self.overtime_hours = Decimal('0.0')
-            self.double_time_hours = Decimal('0.0')
-        elif total_worked <= overtime_hours_limit:
-            self.regular_hours = regular_hours_limit
-            self.overtime_hours = total_worked - regular_hours_limit
-            self.double_time_hours = Decimal('0.0')
-        else:
-            self.regular_hours = regular_hours_limit
-            self.overtime_hours = overtime_hours_limit - regular_hours_limit
-            self.double_time_hours = total_worked - overtime_hours_limit
-        
-        self.total_hours = total_worked
+        # Calculate total worked minutes from the clock times, not the stored total
+        self._apply_worked_minutes(self.worked_duration_minutes)
+    
+    def _apply_worked_minutes(self, total_worked: int) -> None:
+        """Split worked minutes into regular, overtime and double time."""
+        self.regular_minutes = min(total_worked, _REGULAR_MINUTES_LIMIT)
+        self.overtime_minutes = min(
+            max(total_worked - _REGULAR_MINUTES_LIMIT, 0),
+            _OVERTIME_MINUTES_LIMIT - _REGULAR_MINUTES_LIMIT
+        )
+        self.double_time_minutes = max(total_worked - _OVERTIME_MINUTES_LIMIT, 0)
+        self.total_minutes = total_worked
     
     def calculate_break_duration(self) -> None:
-        """Calculate break duration in hours."""
+        """Calculate break and lunch durations from their start and end times."""
         total_break_minutes = 0
         
         # Calculate break time
         if self.break_start_time and self.break_end_time:
-            break_minutes = int((self.break_end_time - self.break_start_time).total_seconds() / 60)
-            total_break_minutes += break_minutes
+            total_break_minutes += _minutes_between(self.break_start_time, self.break_end_time)
         
         # Calculate lunch time
         if self.lunch_start_time and self.lunch_end_time:
-            lunch_minutes = int((self.lunch_end_time - self.lunch_start_time).total_seconds() / 60)
+            lunch_minutes = _minutes_between(self.lunch_start_time, self.lunch_end_time)
             total_break_minutes += lunch_minutes
-            self.lunch_duration = Decimal(str(lunch_minutes / 60))
+            self.lunch_minutes = lunch_minutes
         
         if total_break_minutes > 0:
-            self.break_duration = Decimal(str(total_break_minutes / 60))
+            self.break_minutes = total_break_minutes
+    
+    def recalculate_times(self) -> None:
+        """
+        Recalculate break, lunch and worked-hour fields in one pass.
+        
+        Equivalent to ``calculate_break_duration()`` followed by
+        ``calculate_hours()``, without the second pass over the clock and
+        duration attributes.
+        """
+        break_minutes = 0
+        if self.break_start_time and self.break_end_time:
+            break_minutes = _minutes_between(self.break_start_time, self.break_end_time)
+        
+        if self.lunch_start_time and self.lunch_end_time:
+            lunch_minutes = _minutes_between(self.lunch_start_time, self.lunch_end_time)
+            break_minutes += lunch_minutes
+            self.lunch_minutes = lunch_minutes
+        
+        if break_minutes > 0:
+            self.break_minutes = break_minutes
+        
+        if not self.is_complete:
+            return
+        
+        worked_minutes = _minutes_between(self.clock_in_time, self.clock_out_time)
+        self._apply_worked_minutes(max(0, worked_minutes - (self.break_minutes or 0)))
     
     def clock_in(self, clock_time: Optional[datetime] = None) -> None:
         """Clock in the employee."""
@@ -189,7 +266,6 @@ class TimeEntry(Base):
         
         self.clock_in_time = clock_time or datetime.utcnow()
         self.status = TimeEntryStatus.CLOCKED_IN
-        self.updated_at = datetime.utcnow()
     
     def clock_out(self, clock_time: Optional[datetime] = None) -> None:
         """Clock out the employee."""
@@ -198,11 +274,9 @@ class TimeEntry(Base):
         
         self.clock_out_time = clock_time or datetime.utcnow()
         self.status = TimeEntryStatus.CLOCKED_OUT
-        self.updated_at = datetime.utcnow()
         
         # Calculate hours automatically
-        self.calculate_break_duration()
-        self.calculate_hours()
+        self.recalculate_times()
     
     def start_break(self, break_time: Optional[datetime] = None) -> None:
         """Start a break period."""
@@ -214,20 +288,19 @@ class TimeEntry(Base):
         
         self.break_start_time = break_time or datetime.utcnow()
         self.status = TimeEntryStatus.ON_BREAK
-        self.updated_at = datetime.utcnow()
     
     def end_break(self, break_time: Optional[datetime] = None) -> None:
         """End a break period."""
         if not self.is_on_break:
             raise ValueError("Employee is not on break")
         
+        end_time = break_time or datetime.utcnow()
         if self.break_start_time and not self.break_end_time:
-            self.break_end_time = break_time or datetime.utcnow()
+            self.break_end_time = end_time
         elif self.lunch_start_time and not self.lunch_end_time:
-            self.lunch_end_time = break_time or datetime.utcnow()
+            self.lunch_end_time = end_time
         
         self.status = TimeEntryStatus.CLOCKED_IN
-        self.updated_at = datetime.utcnow()
     
     def start_lunch(self, lunch_time: Optional[datetime] = None) -> None:
         """Start lunch break."""
@@ -239,37 +312,65 @@ class TimeEntry(Base):
         
         self.lunch_start_time = lunch_time or datetime.utcnow()
         self.status = TimeEntryStatus.ON_BREAK
-        self.updated_at = datetime.utcnow()
     
     def submit_for_approval(self) -> None:
         """Submit time entry for approval."""
         if not self.is_complete:
             raise ValueError("Time entry must be complete before submission")
         
-        self.status = TimeEntryStatus.SUBMITTED
-        self.approval_status = ApprovalStatus.PENDING
-        self.submitted_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        for key, value in self.submission_changes().items():
+            setattr(self, key, value)
+    
+    @staticmethod
+    def submission_changes() -> Dict[str, Any]:
+        """Column values that submit a time entry, shared by single and bulk submission."""
+        now = datetime.utcnow()
+        return {
+            "status": TimeEntryStatus.SUBMITTED,
+            "approval_status": ApprovalStatus.PENDING,
+            "submitted_at": now,
+            "updated_at": now,
+        }
+    
+    @staticmethod
+    def approval_changes(approved_by_id: int, notes: Optional[str] = None) -> Dict[str, Any]:
+        """Column values that approve a time entry, shared by single and bulk approval."""
+        now = datetime.utcnow()
+        changes = {
+            "approval_status": ApprovalStatus.APPROVED,
+            "approved_by": approved_by_id,
+            "approved_at": now,
+            "status": TimeEntryStatus.APPROVED,
+            "updated_at": now,
+        }
+        if notes:
+            changes["admin_notes"] = notes
+        return changes
+    
+    @staticmethod
+    def rejection_changes(approved_by_id: int, reason: str) -> Dict[str, Any]:
+        """Column values that reject a time entry, shared by single and bulk rejection."""
+        now = datetime.utcnow()
+        return {
+            "approval_status": ApprovalStatus.REJECTED,
+            "approved_by": approved_by_id,
+            "approved_at": now,
+            "rejection_reason": reason,
+            "status": TimeEntryStatus.REJECTED,
+            "updated_at": now,
+        }
     
     def approve(self, approved_by_id: int, notes: Optional[str] = None) -> None:
         """Approve the time entry."""
-        self.approval_status = ApprovalStatus.APPROVED
-        self.approved_by = approved_by_id
-        self.approved_at = datetime.utcnow()
-        self.status = TimeEntryStatus.APPROVED
-        if notes:
-            self.admin_notes = notes
-        self.updated_at = datetime.utcnow()
+        for key, value in self.approval_changes(approved_by_id, notes).items():
+            setattr(self, key, value)
     
     def reject(self, approved_by_id: int, reason: str) -> None:
         """Reject the time entry."""
-        self.approval_status = ApprovalStatus.REJECTED
-        self.approved_by = approved_by_id
-        self.approved_at = datetime.utcnow()
-        self.rejection_reason = reason
-        self.status = TimeEntryStatus.REJECTED
-        self.updated_at = datetime.utcnow()
+        for key, value in self.rejection_changes(approved_by_id, reason).items():
+            setattr(self, key, value)
     
+    @hybrid_method
     def is_valid_for_payroll(self) -> bool:
         """Check if time entry is valid for payroll processing."""
         return (
@@ -277,4 +378,13 @@ class TimeEntry(Base):
             self.is_complete and
             self.total_hours is not None and
             self.total_hours > 0
-        ) 
\ No newline at end of file
+        )
+    
+    @is_valid_for_payroll.expression
+    def is_valid_for_payroll(cls):
+        return and_(
+            cls.approval_status == ApprovalStatus.APPROVED,
+            cls.clock_in_time.is_not(None),
+            cls.clock_out_time.is_not(None),
+            cls.total_minutes > 0
+        )
\ No newline at end of file
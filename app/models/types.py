@@ -0,0 +1,91 @@
+"""
+Custom column types for the Payroll Management System.
+
+This module defines SQLAlchemy column types shared across models.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional
+
+from cryptography.fernet import Fernet
+from sqlalchemy import BigInteger, String
+from sqlalchemy.types import TypeDecorator
+
+from app.core.config import settings
+
+_CENT = Decimal("0.01")
+
+# Every Fernet token starts with the base64 of its 0x80 version byte
+_FERNET_TOKEN_PREFIX = "gAAAAA"
+
+
+class MoneyCents(TypeDecorator):
+    """
+    Monetary amount stored as integer cents in a BIGINT column.
+    
+    Values are bound and returned as ``Decimal`` with two places, so model
+    and service code keeps working in currency units, while the database
+    stores, sums and compares plain integers. ``SUM()`` over a money column
+    keeps this type and comes back in currency units too.
+    """
+    
+    impl = BigInteger
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        """Convert a currency amount to integer cents."""
+        if value is None:
+            return None
+        if not isinstance(value, Decimal):
+            value = Decimal(str(value))
+        return int(value.quantize(_CENT, rounding=ROUND_HALF_UP).scaleb(2))
+    
+    def process_result_value(self, value, dialect) -> Optional[Decimal]:
+        """Convert integer cents back to a currency amount."""
+        if value is None:
+            return None
+        return Decimal(int(value)).scaleb(-2)
+
+
+class EncryptedStr(TypeDecorator):
+    """
+    String column encrypted at rest with Fernet.
+    
+    Values are encrypted on bind and decrypted on load. The cipher is built
+    once per process from ``FIELD_ENCRYPTION_KEY`` and shared by every
+    column using this type. Stored values that are not Fernet tokens are
+    legacy plaintext from before encryption and are returned unchanged;
+    they are encrypted the next time the row is written.
+    """
+    
+    impl = String
+    cache_ok = True
+    
+    _cipher: Optional[Fernet] = None
+    
+    @classmethod
+    def cipher(cls) -> Fernet:
+        """Get the process-wide Fernet cipher."""
+        if cls._cipher is None:
+            key = settings.FIELD_ENCRYPTION_KEY
+            if not key:
+                raise RuntimeError(
+                    "FIELD_ENCRYPTION_KEY is not set; generate one with "
+                    "cryptography.fernet.Fernet.generate_key()"
+                )
+            cls._cipher = Fernet(key)
+        return cls._cipher
+    
+    def process_bind_param(self, value, dialect) -> Optional[str]:
+        """Encrypt a plaintext value."""
+        if not value:
+            return None
+        return self.cipher().encrypt(value.encode("utf-8")).decode("ascii")
+    
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        """Decrypt a stored token."""
+        if value is None:
+            return None
+        if not value.startswith(_FERNET_TOKEN_PREFIX):
+            return value
+        return self.cipher().decrypt(value.encode("ascii")).decode("utf-8")
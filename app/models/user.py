@@ -6,21 +6,30 @@ authentication, and role-based access control.
 """
 
 from datetime import datetime
+from functools import cached_property
 from typing import Optional
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, Integer, String, Text, Index
+from sqlalchemy import DDL, Boolean, Column, DateTime, Enum, Integer, String, Text, Index, and_, event, false, func, text, true
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
 from app.models.enums import UserRole, UserStatus
 
+# Roles granted each permission
+_ADMIN_ROLES = frozenset({UserRole.ADMIN, UserRole.SUPER_ADMIN})
+_HR_ROLES = _ADMIN_ROLES | {UserRole.HR}
+_MANAGER_ROLES = _HR_ROLES | {UserRole.MANAGER}
+_PAYROLL_ROLES = _ADMIN_ROLES | {UserRole.PAYROLL_ADMIN}
+_REPORT_ROLES = _MANAGER_ROLES | _PAYROLL_ROLES
+
 
 class User(Base):
     """User model for authentication and authorization."""
     
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
     username = Column(String(50), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
@@ -31,9 +40,9 @@ class User(Base):
     phone = Column(String(20), nullable=True)
     
     # Account Status
-    is_active = Column(Boolean, default=True)
-    is_verified = Column(Boolean, default=False)
-    is_superuser = Column(Boolean, default=False)
+    is_active = Column(Boolean, server_default=true())
+    is_verified = Column(Boolean, server_default=false())
+    is_superuser = Column(Boolean, server_default=false())
     role = Column(Enum(UserRole), default=UserRole.USER)
     status = Column(Enum(UserStatus), default=UserStatus.ACTIVE)
     
@@ -43,7 +52,7 @@ class User(Base):
     last_login = Column(DateTime, nullable=True)
     
     # Security
-    failed_login_attempts = Column(Integer, default=0)
+    failed_login_attempts = Column(Integer, server_default=text('0'))
     locked_until = Column(DateTime, nullable=True)
     password_reset_token = Column(String(255), nullable=True)
     password_reset_expires = Column(DateTime, nullable=True)
@@ -56,19 +65,24 @@ class User(Base):
     employee = relationship("Employee", back_populates="user", uselist=False)
     # audit_logs = relationship("AuditLog", back_populates="user")
     
-    # Performance indexes
+    # Column defaults come from the database; fetch them back in the INSERT
+    # (RETURNING) instead of a follow-up SELECT on first access
+    __mapper_args__ = {"eager_defaults": True}
+    
+    # Performance indexes; role lookups use the composites below, which lead
+    # with it, and the boolean flags are only indexed alongside role/status
     __table_args__ = (
-        Index('idx_user_role', 'role'),
         Index('idx_user_status', 'status'),
-        Index('idx_user_is_active', 'is_active'),
-        Index('idx_user_is_verified', 'is_verified'),
-        Index('idx_user_is_superuser', 'is_superuser'),
         Index('idx_user_created_at', 'created_at'),
         Index('idx_user_updated_at', 'updated_at'),
         Index('idx_user_last_login', 'last_login'),
-        Index('idx_user_failed_attempts', 'failed_login_attempts'),
-        Index('idx_user_locked_until', 'locked_until'),
         Index('idx_user_name_search', 'first_name', 'last_name'),
+        # Partial index over the (few) locked accounts only
+        Index(
+            'idx_user_locked_until', 'locked_until',
+            postgresql_where=text('locked_until IS NOT NULL'),
+            sqlite_where=text('locked_until IS NOT NULL'),
+        ),
         # Composite indexes for common filter combinations
         Index('idx_user_role_status', 'role', 'status'),
         Index('idx_user_active_role', 'is_active', 'role'),
@@ -79,33 +93,51 @@ class User(Base):
     def __repr__(self) -> str:
         return f"<User(id={self.id}, email='{self.email}', role='{self.role}')>"
     
-    @property
+    @cached_property
     def full_name(self) -> str:
         """Get the user's full name."""
         return f"{self.first_name} {self.last_name}"
     
-    @property
+    @hybrid_property
+    def search_text(self) -> str:
+        """Lower-cased name, email and username used for user search."""
+        return f"{self.first_name} {self.last_name} {self.email} {self.username}".lower()
+    
+    @search_text.expression
+    def search_text(cls):
+        return func.lower(
+            cls.first_name + " " + cls.last_name + " " + cls.email + " " + cls.username
+        )
+    
+    @cached_property
     def is_admin(self) -> bool:
         """Check if user is an admin."""
-        return self.role in [UserRole.ADMIN, UserRole.SUPER_ADMIN]
+        return self.role in _ADMIN_ROLES
     
-    @property
+    @cached_property
     def is_hr(self) -> bool:
         """Check if user is HR personnel."""
-        return self.role in [UserRole.HR, UserRole.ADMIN, UserRole.SUPER_ADMIN]
+        return self.role in _HR_ROLES
     
-    @property
+    @cached_property
     def is_manager(self) -> bool:
         """Check if user is a manager."""
-        return self.role in [UserRole.MANAGER, UserRole.HR, UserRole.ADMIN, UserRole.SUPER_ADMIN]
+        return self.role in _MANAGER_ROLES
     
-    @property
+    @hybrid_property
     def is_locked(self) -> bool:
         """Check if user account is locked."""
         if self.locked_until is None:
             return False
         return datetime.utcnow() < self.locked_until
     
+    @is_locked.expression
+    def is_locked(cls):
+        # locked_until is stored as naive UTC, so compare against a bound
+        # utcnow() rather than the database clock. The explicit IS NOT NULL
+        # keeps ~User.is_locked true for accounts that were never locked
+        return and_(cls.locked_until.is_not(None), cls.locked_until > datetime.utcnow())
+    
     def can_access_employee_data(self, employee_id: int) -> bool:
         """Check if user can access specific employee data."""
         if self.is_admin or self.is_hr:
@@ -116,8 +148,41 @@ class User(Base):
     
     def can_modify_payroll(self) -> bool:
         """Check if user can modify payroll data."""
-        return self.role in [UserRole.PAYROLL_ADMIN, UserRole.ADMIN, UserRole.SUPER_ADMIN]
+        return self.role in _PAYROLL_ROLES
     
     def can_view_reports(self) -> bool:
         """Check if user can view reports."""
-        return self.role in [UserRole.MANAGER, UserRole.HR, UserRole.PAYROLL_ADMIN, UserRole.ADMIN, UserRole.SUPER_ADMIN] 
\ No newline at end of file
+        return self.role in _REPORT_ROLES
+
+
+# Name and role checks are cached on the instance; drop them whenever their
+# source columns change or are reloaded so they never go stale
+_CACHED_ATTRS = ("full_name", "is_admin", "is_hr", "is_manager")
+_CACHED_SOURCE_COLUMNS = ("first_name", "last_name", "role")
+
+
+def _clear_cached_attrs(target, *args) -> None:
+    """Forget the cached derived properties of a user."""
+    for attr in _CACHED_ATTRS:
+        target.__dict__.pop(attr, None)
+
+
+event.listen(User, "refresh", _clear_cached_attrs)
+event.listen(User, "expire", _clear_cached_attrs)
+for _column in _CACHED_SOURCE_COLUMNS:
+    event.listen(getattr(User, _column), "set", _clear_cached_attrs)
+
+
+# Trigram index backing the admin user search (PostgreSQL only)
+Index(
+    "ix_users_search",
+    User.search_text.label("search_text"),
+    postgresql_using="gin",
+    postgresql_ops={"search_text": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+event.listen(
+    User.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -1,75 +1,73 @@
 """
 Pydantic schemas for the Payroll Management System.
 
-This module imports all schemas for API request/response validation.
+This module exposes all schemas for API request/response validation.
+
+Names are loaded lazily (PEP 562): ``from app.schemas import UserCreate``
+imports only ``app.schemas.user``.
 """
 
-from app.schemas.user import (
-    UserBase,
-    UserCreate,
-    UserUpdate,
-    UserResponse,
-    UserLogin,
-    UserLoginResponse,
-    TokenRefresh,
-    PasswordChange,
-    PasswordReset,
-    PasswordResetConfirm,
-    UserList,
-)
+import importlib
+
+# Public name -> defining module
+_LAZY = {
+    **{
+        name: "app.schemas.user"
+        for name in (
+            "UserBase", "UserCreate", "UserUpdate", "UserResponse", "UserLogin",
+            "UserLoginResponse", "TokenRefresh", "PasswordChange", "PasswordReset",
+            "PasswordResetConfirm", "UserList",
+        )
+    },
+    **{
+        name: "app.schemas.employee"
+        for name in (
+            "EmployeeBase", "EmployeeCreate", "EmployeeUpdate", "EmployeeResponse",
+            "EmployeeList", "EmployeeSummary",
+        )
+    },
+    **{
+        name: "app.schemas.payroll"
+        for name in (
+            "PayrollCalculationRequest", "PayrollCalculationResponse", "PayPeriodCreate",
+            "PayPeriodResponse", "PayrollRecordCreate", "PayrollRecordResponse",
+            "PayrollBatchRequest", "PayrollBatchResponse", "PayrollSummary",
+        )
+    },
+    **{
+        name: "app.schemas.time_entry"
+        for name in (
+            "TimeEntryBase", "TimeEntryCreate", "TimeEntryUpdate", "TimeEntryResponse",
+            "TimeEntryList", "TimeEntrySummary", "TimeEntryStats", "ClockInRequest",
+            "ClockOutRequest", "BreakRequest", "TimeEntryApproval", "EmployeeTimeReport",
+        )
+    },
+    **{
+        name: "app.schemas.reports"
+        for name in (
+            "ReportRequest", "ReportMetadata", "ReportResponse", "ReportListResponse",
+            "PayRegisterReport", "TaxLiabilityReport", "EmployeeRosterReport",
+            "SalaryAnalysisReport", "ComplianceReport", "TimeSummaryReport",
+            "PayRegisterEntry", "EmployeeRosterEntry", "ComplianceEntry", "TimeSummaryEntry",
+        )
+    },
+}
+
+
+def __getattr__(name: str):
+    """Import a schema on first access and cache it on the package."""
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from app.schemas.employee import (
-    EmployeeBase,
-    EmployeeCreate,
-    EmployeeUpdate,
-    EmployeeResponse,
-    EmployeeList,
-    EmployeeSummary,
-)
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
 
-from app.schemas.payroll import (
-    PayrollCalculationRequest,
-    PayrollCalculationResponse,
-    PayPeriodCreate,
-    PayPeriodResponse,
-    PayrollRecordCreate,
-    PayrollRecordResponse,
-    PayrollBatchRequest,
-    PayrollBatchResponse,
-    PayrollSummary,
-)
 
-from app.schemas.time_entry import (
-    TimeEntryBase,
-    TimeEntryCreate,
-    TimeEntryUpdate,
-    TimeEntryResponse,
-    TimeEntryList,
-    TimeEntrySummary,
-    TimeEntryStats,
-    ClockInRequest,
-    ClockOutRequest,
-    BreakRequest,
-    TimeEntryApproval,
-    EmployeeTimeReport,
-)
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
 
-from app.schemas.reports import (
-    ReportRequest,
-    ReportMetadata,
-    ReportResponse,
-    ReportListResponse,
-    PayRegisterReport,
-    TaxLiabilityReport,
-    EmployeeRosterReport,
-    SalaryAnalysisReport,
-    ComplianceReport,
-    TimeSummaryReport,
-    PayRegisterEntry,
-    EmployeeRosterEntry,
-    ComplianceEntry,
-    TimeSummaryEntry,
-)
 
 __all__ = [
     # User schemas
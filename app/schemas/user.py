@@ -85,6 +85,8 @@ class UserResponse(UserBase):
     
     model_config = ConfigDict(
         from_attributes=True,
+        frozen=True,
+        extra="ignore",
         json_schema_extra={
             "example": {
                 "id": 1,
@@ -10,7 +10,7 @@ from typing import Optional, List, Dict, Any, Union
 from datetime import datetime, date
 from decimal import Decimal
 
-from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
 from sqlalchemy import and_, or_, desc, asc, func
 from sqlalchemy.exc import IntegrityError
 
@@ -192,10 +192,12 @@ class EmployeeService:
                 logger.debug(f"Cache hit for employees list: skip={skip}, limit={limit}")
                 return cached_employees
             
-            # Build query with optimized loading
+            # Build query with optimized loading; other relationships raise
+            # rather than lazy-load once per listed employee
             query = self.db.query(Employee).options(
                 joinedload(Employee.user),
-                joinedload(Employee.manager)
+                joinedload(Employee.manager),
+                raiseload('*')
             )
             
             # Apply filters
@@ -325,7 +327,6 @@ class EmployeeService:
             for field, value in update_data.items():
                 setattr(employee, field, value)
             
-            employee.updated_at = datetime.utcnow()
             self.db.commit()
             self.db.refresh(employee)
             
@@ -359,7 +360,6 @@ class EmployeeService:
             # Soft delete by setting status to TERMINATED
             employee.status = EmployeeStatus.TERMINATED
             employee.termination_date = date.today()
-            employee.updated_at = datetime.utcnow()
             
             self.db.commit()
             
@@ -11,14 +11,14 @@ from decimal import Decimal, ROUND_HALF_UP
 from typing import Optional, List, Dict, Any
 import uuid
 
-from sqlalchemy.orm import Session, joinedload, selectinload
-from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+from sqlalchemy import and_, or_, func, insert
 from sqlalchemy.exc import IntegrityError
 
 from app.models.employee import Employee
 from app.models.payroll import PayrollRecord, PayPeriod
 from app.models.user import User
-from app.models.time_entry import TimeEntry
+from app.models.time_entry import TimeEntry, minutes_to_hours
 from app.models.enums import EmployeeStatus, PayrollFrequency, PayrollStatus, ApprovalStatus
 from app.schemas.payroll import (
     PayrollCalculationRequest, PayrollCalculationResponse,
@@ -26,10 +26,21 @@ from app.schemas.payroll import (
     PayrollBatchRequest, PayrollBatchResponse,
     PayrollSummary
 )
-from app.core.config import get_settings
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
+
+# Decimal constants for the payroll calculations, parsed once
+_ZERO = Decimal('0.00')
+_CENT = Decimal('0.01')
+_FEDERAL_ALLOWANCE = Decimal('50.00')
+_STATE_TAX_RATE = Decimal('0.05')
+_STATE_ALLOWANCE = Decimal('25.00')
+
+# Monthly benefit premiums
+_HEALTH_INSURANCE_MONTHLY = Decimal('200.00')
+_DENTAL_INSURANCE_MONTHLY = Decimal('50.00')
+_VISION_INSURANCE_MONTHLY = Decimal('25.00')
 
 
 class PayrollService:
@@ -105,19 +116,19 @@ class PayrollService:
                 "time_entries_count": time_data["time_entries_count"],
                 "gross_pay": gross_pay,
                 "tax_deductions": {
-                    "federal_income_tax": deductions.get("federal_income_tax", Decimal('0.00')),
-                    "state_income_tax": deductions.get("state_income_tax", Decimal('0.00')),
-                    "social_security_tax": deductions.get("social_security_tax", Decimal('0.00')),
-                    "medicare_tax": deductions.get("medicare_tax", Decimal('0.00'))
+                    "federal_income_tax": deductions.get("federal_income_tax", _ZERO),
+                    "state_income_tax": deductions.get("state_income_tax", _ZERO),
+                    "social_security_tax": deductions.get("social_security_tax", _ZERO),
+                    "medicare_tax": deductions.get("medicare_tax", _ZERO)
                 },
                 "benefit_deductions": {
-                    "health_insurance": deductions.get("health_insurance", Decimal('0.00')),
-                    "dental_insurance": deductions.get("dental_insurance", Decimal('0.00')),
-                    "vision_insurance": deductions.get("vision_insurance", Decimal('0.00')),
-                    "retirement_401k": deductions.get("retirement_401k", Decimal('0.00'))
+                    "health_insurance": deductions.get("health_insurance", _ZERO),
+                    "dental_insurance": deductions.get("dental_insurance", _ZERO),
+                    "vision_insurance": deductions.get("vision_insurance", _ZERO),
+                    "retirement_401k": deductions.get("retirement_401k", _ZERO)
                 },
                 "other_deductions": {
-                    "other_deductions": deductions.get("other_deductions", Decimal('0.00'))
+                    "other_deductions": deductions.get("other_deductions", _ZERO)
                 },
                 "total_deductions": deductions["total_deductions"],
                 "net_pay": net_pay,
@@ -140,7 +151,7 @@ class PayrollService:
     ) -> Decimal:
         """Calculate gross pay for an employee."""
         try:
-            gross_pay = Decimal('0.00')
+            gross_pay = _ZERO
             
             if employee.is_salaried:
                 # Calculate salary-based pay
@@ -165,7 +176,7 @@ class PayrollService:
             if bonus_amount > 0:
                 gross_pay += Decimal(str(bonus_amount))
             
-            return gross_pay.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            return gross_pay.quantize(_CENT, rounding=ROUND_HALF_UP)
             
         except Exception as e:
             logger.error(f"Error calculating gross pay: {e}")
@@ -194,31 +205,32 @@ class PayrollService:
             if not use_time_entries:
                 return time_data
             
-            # Get approved time entries for the pay period
-            time_entries = self.db.query(TimeEntry).filter(
+            # Total the approved time entries for the pay period in the database
+            entries_count, total_minutes, regular_minutes, overtime_minutes, double_time_minutes = self.db.query(
+                func.count(TimeEntry.id),
+                func.coalesce(func.sum(TimeEntry.total_minutes), 0),
+                func.coalesce(func.sum(TimeEntry.regular_minutes), 0),
+                func.coalesce(func.sum(TimeEntry.overtime_minutes), 0),
+                func.coalesce(func.sum(TimeEntry.double_time_minutes), 0)
+            ).filter(
                 TimeEntry.employee_id == employee_id,
                 TimeEntry.work_date >= pay_period_start,
                 TimeEntry.work_date <= pay_period_end,
                 TimeEntry.approval_status == ApprovalStatus.APPROVED
-            ).all()
-            
-            if time_entries:
-                # Calculate totals from time entries
-                total_hours = sum(entry.total_hours or Decimal('0.00') for entry in time_entries)
-                regular_hours = sum(entry.regular_hours or Decimal('0.00') for entry in time_entries)
-                overtime_hours = sum(entry.overtime_hours or Decimal('0.00') for entry in time_entries)
-                double_time_hours = sum(entry.double_time_hours or Decimal('0.00') for entry in time_entries)
-                
+            ).one()
+            
+            if entries_count:
+                total_hours = minutes_to_hours(total_minutes)
                 time_data.update({
                     "hours_worked": float(total_hours),
-                    "regular_hours": float(regular_hours),
-                    "overtime_hours": float(overtime_hours),
-                    "double_time_hours": float(double_time_hours),
+                    "regular_hours": float(minutes_to_hours(regular_minutes)),
+                    "overtime_hours": float(minutes_to_hours(overtime_minutes)),
+                    "double_time_hours": float(minutes_to_hours(double_time_minutes)),
                     "time_entries_used": True,
-                    "time_entries_count": len(time_entries)
+                    "time_entries_count": entries_count
                 })
                 
-                logger.info(f"Using time entries for employee {employee_id}: {len(time_entries)} entries, {total_hours} total hours")
+                logger.info(f"Using time entries for employee {employee_id}: {entries_count} entries, {total_hours} total hours")
             else:
                 logger.info(f"No approved time entries found for employee {employee_id}, using fallback hours: {fallback_hours}")
             
@@ -255,7 +267,7 @@ class PayrollService:
                 if key != "total_deductions" and isinstance(value, Decimal)
             )
             
-            deductions["total_deductions"] = total_deductions.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            deductions["total_deductions"] = total_deductions.quantize(_CENT, rounding=ROUND_HALF_UP)
             
             return deductions
             
@@ -278,11 +290,11 @@ class PayrollService:
             
             # Social Security tax (6.2% up to wage base)
             social_security_tax = gross_pay * Decimal(str(settings.SOCIAL_SECURITY_RATE))
-            tax_deductions["social_security_tax"] = social_security_tax.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            tax_deductions["social_security_tax"] = social_security_tax.quantize(_CENT, rounding=ROUND_HALF_UP)
             
             # Medicare tax (1.45%)
             medicare_tax = gross_pay * Decimal(str(settings.MEDICARE_RATE))
-            tax_deductions["medicare_tax"] = medicare_tax.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            tax_deductions["medicare_tax"] = medicare_tax.quantize(_CENT, rounding=ROUND_HALF_UP)
             
             return tax_deductions
             
@@ -300,20 +312,20 @@ class PayrollService:
             base_tax = gross_pay * Decimal(str(settings.DEFAULT_TAX_RATE))
             
             # Apply allowances (simplified)
-            allowance_reduction = Decimal(str(employee.federal_allowances)) * Decimal('50.00')
+            allowance_reduction = Decimal(str(employee.federal_allowances)) * _FEDERAL_ALLOWANCE
             federal_tax = base_tax - allowance_reduction
             
             # Add additional withholding
             federal_tax += Decimal(str(employee.additional_federal_withholding))
             
             # Ensure tax is not negative
-            federal_tax = max(federal_tax, Decimal('0.00'))
+            federal_tax = max(federal_tax, _ZERO)
             
-            return federal_tax.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            return federal_tax.quantize(_CENT, rounding=ROUND_HALF_UP)
             
         except Exception as e:
             logger.error(f"Error calculating federal income tax: {e}")
-            return Decimal('0.00')
+            return _ZERO
     
     def _calculate_state_income_tax(self, employee: Employee, gross_pay: Decimal) -> Decimal:
         """Calculate state income tax (simplified)."""
@@ -322,23 +334,23 @@ class PayrollService:
             # In a real system, you would use state-specific tax tables
             
             # Base calculation (5% as example)
-            base_tax = gross_pay * Decimal('0.05')
+            base_tax = gross_pay * _STATE_TAX_RATE
             
             # Apply allowances (simplified)
-            allowance_reduction = Decimal(str(employee.state_allowances)) * Decimal('25.00')
+            allowance_reduction = Decimal(str(employee.state_allowances)) * _STATE_ALLOWANCE
             state_tax = base_tax - allowance_reduction
             
             # Add additional withholding
             state_tax += Decimal(str(employee.additional_state_withholding))
             
             # Ensure tax is not negative
-            state_tax = max(state_tax, Decimal('0.00'))
+            state_tax = max(state_tax, _ZERO)
             
-            return state_tax.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            return state_tax.quantize(_CENT, rounding=ROUND_HALF_UP)
             
         except Exception as e:
             logger.error(f"Error calculating state income tax: {e}")
-            return Decimal('0.00')
+            return _ZERO
     
     def _calculate_benefit_deductions(self, employee: Employee, gross_pay: Decimal) -> Dict[str, Decimal]:
         """Calculate benefit deductions."""
@@ -348,7 +360,7 @@ class PayrollService:
             # Health insurance
             if employee.health_insurance:
                 health_insurance = self._prorate_monthly_deduction(
-                    Decimal('200.00'), 
+                    _HEALTH_INSURANCE_MONTHLY, 
                     employee.payroll_frequency
                 )
                 benefit_deductions["health_insurance"] = health_insurance
@@ -356,7 +368,7 @@ class PayrollService:
             # Dental insurance
             if employee.dental_insurance:
                 dental_insurance = self._prorate_monthly_deduction(
-                    Decimal('50.00'), 
+                    _DENTAL_INSURANCE_MONTHLY, 
                     employee.payroll_frequency
                 )
                 benefit_deductions["dental_insurance"] = dental_insurance
@@ -364,7 +376,7 @@ class PayrollService:
             # Vision insurance
             if employee.vision_insurance:
                 vision_insurance = self._prorate_monthly_deduction(
-                    Decimal('25.00'), 
+                    _VISION_INSURANCE_MONTHLY, 
                     employee.payroll_frequency
                 )
                 benefit_deductions["vision_insurance"] = vision_insurance
@@ -372,7 +384,7 @@ class PayrollService:
             # 401k contribution
             if employee.retirement_401k and employee.retirement_401k_percent > 0:
                 retirement_401k = gross_pay * (Decimal(str(employee.retirement_401k_percent)) / 100)
-                benefit_deductions["retirement_401k"] = retirement_401k.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+                benefit_deductions["retirement_401k"] = retirement_401k.quantize(_CENT, rounding=ROUND_HALF_UP)
             
             return benefit_deductions
             
@@ -384,19 +396,19 @@ class PayrollService:
         """Prorate monthly deduction amount based on payroll frequency."""
         try:
             if frequency == PayrollFrequency.WEEKLY:
-                return (monthly_amount * 12 / 52).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+                return (monthly_amount * 12 / 52).quantize(_CENT, rounding=ROUND_HALF_UP)
             elif frequency == PayrollFrequency.BIWEEKLY:
-                return (monthly_amount * 12 / 26).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+                return (monthly_amount * 12 / 26).quantize(_CENT, rounding=ROUND_HALF_UP)
             elif frequency == PayrollFrequency.SEMI_MONTHLY:
-                return (monthly_amount / 2).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+                return (monthly_amount / 2).quantize(_CENT, rounding=ROUND_HALF_UP)
             elif frequency == PayrollFrequency.MONTHLY:
-                return monthly_amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+                return monthly_amount.quantize(_CENT, rounding=ROUND_HALF_UP)
             else:
-                return monthly_amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+                return monthly_amount.quantize(_CENT, rounding=ROUND_HALF_UP)
                 
         except Exception as e:
             logger.error(f"Error prorating monthly deduction: {e}")
-            return Decimal('0.00')
+            return _ZERO
     
     def get_employee_by_id(self, employee_id: int) -> Optional[Employee]:
         """Get employee by ID with optimized loading."""
@@ -420,36 +432,14 @@ class PayrollService:
             if not pay_period:
                 raise ValueError(f"Pay period not found: {pay_period_id}")
             
-            # Calculate payroll
-            payroll_data = self.calculate_employee_payroll(
+            # Calculate payroll and create the record
+            payroll_record = PayrollRecord(**self._build_payroll_row(
                 employee_id=employee_id,
-                pay_period_start=pay_period.start_date,
-                pay_period_end=pay_period.end_date,
+                pay_period=pay_period,
                 hours_worked=hours_worked,
-                overtime_hours=overtime_hours
-            )
-            
-            # Create payroll record
-            payroll_record = PayrollRecord(
-                employee_id=employee_id,
-                pay_period_id=pay_period_id,
-                hours_worked=payroll_data["hours_worked"],
-                overtime_hours=payroll_data["overtime_hours"],
-                gross_pay=payroll_data["gross_pay"],
-                net_pay=payroll_data["net_pay"],
-                federal_income_tax=payroll_data["tax_deductions"]["federal_income_tax"],
-                state_income_tax=payroll_data["tax_deductions"]["state_income_tax"],
-                social_security_tax=payroll_data["tax_deductions"]["social_security_tax"],
-                medicare_tax=payroll_data["tax_deductions"]["medicare_tax"],
-                health_insurance=payroll_data["benefit_deductions"]["health_insurance"],
-                dental_insurance=payroll_data["benefit_deductions"]["dental_insurance"],
-                vision_insurance=payroll_data["benefit_deductions"]["vision_insurance"],
-                retirement_401k=payroll_data["benefit_deductions"]["retirement_401k"],
-                other_deductions=payroll_data["other_deductions"].get("other_deductions", Decimal('0.00')),
-                total_deductions=payroll_data["total_deductions"],
-                status=PayrollStatus.PROCESSED if process_immediately else PayrollStatus.DRAFT,
-                processed_at=datetime.utcnow() if process_immediately else None
-            )
+                overtime_hours=overtime_hours,
+                process_immediately=process_immediately
+            ))
             
             self.db.add(payroll_record)
             self.db.commit()
@@ -462,6 +452,84 @@ class PayrollService:
             logger.error(f"Error creating payroll record: {e}")
             raise
     
+    def _build_payroll_row(
+        self,
+        employee_id: int,
+        pay_period: PayPeriod,
+        hours_worked: float = 0,
+        overtime_hours: float = 0,
+        process_immediately: bool = False
+    ) -> Dict[str, Any]:
+        """Calculate an employee's payroll as PayrollRecord column values."""
+        payroll_data = self.calculate_employee_payroll(
+            employee_id=employee_id,
+            pay_period_start=pay_period.start_date,
+            pay_period_end=pay_period.end_date,
+            hours_worked=hours_worked,
+            overtime_hours=overtime_hours
+        )
+        
+        return {
+            "employee_id": employee_id,
+            "pay_period_id": pay_period.id,
+            "hours_worked": payroll_data["hours_worked"],
+            "overtime_hours": payroll_data["overtime_hours"],
+            "gross_pay": payroll_data["gross_pay"],
+            "net_pay": payroll_data["net_pay"],
+            "federal_income_tax": payroll_data["tax_deductions"]["federal_income_tax"],
+            "state_income_tax": payroll_data["tax_deductions"]["state_income_tax"],
+            "social_security_tax": payroll_data["tax_deductions"]["social_security_tax"],
+            "medicare_tax": payroll_data["tax_deductions"]["medicare_tax"],
+            "health_insurance": payroll_data["benefit_deductions"]["health_insurance"],
+            "dental_insurance": payroll_data["benefit_deductions"]["dental_insurance"],
+            "vision_insurance": payroll_data["benefit_deductions"]["vision_insurance"],
+            "retirement_401k": payroll_data["benefit_deductions"]["retirement_401k"],
+            "other_deductions": payroll_data["other_deductions"].get("other_deductions", _ZERO),
+            "total_deductions": payroll_data["total_deductions"],
+            "status": PayrollStatus.PROCESSED if process_immediately else PayrollStatus.DRAFT,
+            "processed_at": datetime.utcnow() if process_immediately else None
+        }
+    
+    def _insert_payroll_rows(
+        self,
+        rows: List[Dict[str, Any]],
+        errors: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert payroll rows, isolating the employees whose row fails.
+        
+        All rows go in one multi-row INSERT inside a savepoint. If that
+        fails, the savepoint is rolled back and the rows are retried one
+        savepoint each, so a bad row only fails its own employee.
+        
+        Args:
+            rows: PayrollRecord column values, one dict per employee
+            errors: Per-employee error messages, appended to in place
+            
+        Returns:
+            The rows that were inserted
+        """
+        if not rows:
+            return []
+        
+        try:
+            with self.db.begin_nested():
+                self.db.execute(insert(PayrollRecord), rows)
+            return rows
+        except Exception as e:
+            logger.warning(f"Bulk payroll insert failed, retrying per employee: {e}")
+        
+        inserted = []
+        for row in rows:
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(PayrollRecord), [row])
+                inserted.append(row)
+            except Exception as e:
+                errors.append(f"Employee {row['employee_id']}: {str(e)}")
+                logger.error(f"Error saving payroll for employee {row['employee_id']}: {e}")
+        return inserted
+    
     def create_pay_period(self, pay_period_data: PayPeriodCreate) -> PayPeriod:
         """Create a new pay period."""
         try:
@@ -541,15 +609,9 @@ class PayrollService:
     
     def get_current_pay_period(self) -> Optional[PayPeriod]:
         """Get the current pay period with optimized loading."""
-        today = date.today()
         return self.db.query(PayPeriod).options(
             selectinload(PayPeriod.payroll_records)
-        ).filter(
-            and_(
-                PayPeriod.start_date <= today,
-                PayPeriod.end_date >= today
-            )
-        ).first()
+        ).filter(PayPeriod.is_current_period).first()
     
     def process_payroll_batch(
         self, 
@@ -562,32 +624,40 @@ class PayrollService:
             start_time = datetime.utcnow()
             batch_id = f"batch_{start_time.strftime('%Y_%m_%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
             
-            processed_count = 0
-            error_count = 0
             errors = []
-            total_gross_pay = Decimal('0.00')
-            total_net_pay = Decimal('0.00')
-            total_deductions = Decimal('0.00')
             
+            pay_period = self.get_pay_period(pay_period_id)
+            if not pay_period:
+                raise ValueError(f"Pay period not found: {pay_period_id}")
+            
+            # Calculate every employee first, then write all records in one
+            # multi-row INSERT instead of a flush and commit per employee
+            rows = []
             for employee_id in employee_ids:
                 try:
-                    # Create payroll record for each employee
-                    payroll_record = self.create_payroll_record(
+                    rows.append(self._build_payroll_row(
                         employee_id=employee_id,
-                        pay_period_id=pay_period_id,
+                        pay_period=pay_period,
                         process_immediately=process_immediately
-                    )
-                    
-                    processed_count += 1
-                    total_gross_pay += payroll_record.gross_pay
-                    total_net_pay += payroll_record.net_pay
-                    total_deductions += payroll_record.total_deductions
-                    
+                    ))
                 except Exception as e:
-                    error_count += 1
                     errors.append(f"Employee {employee_id}: {str(e)}")
                     logger.error(f"Error processing payroll for employee {employee_id}: {e}")
             
+            try:
+                inserted = self._insert_payroll_rows(rows, errors)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            
+            # Only records that were actually written count towards the totals
+            processed_count = len(inserted)
+            error_count = len(errors)
+            total_gross_pay = sum((row["gross_pay"] for row in inserted), _ZERO)
+            total_net_pay = sum((row["net_pay"] for row in inserted), _ZERO)
+            total_deductions = sum((row["total_deductions"] for row in inserted), _ZERO)
+            
             end_time = datetime.utcnow()
             processing_time = (end_time - start_time).total_seconds()
             
@@ -615,10 +685,13 @@ class PayrollService:
         limit: int = 100
     ) -> List[PayrollRecord]:
         """Get payroll records with optimized loading and filtering."""
+        # raiseload('*') makes any relationship not loaded here fail fast
+        # instead of issuing one lazy SELECT per record
         query = self.db.query(PayrollRecord).options(
             joinedload(PayrollRecord.employee),
             joinedload(PayrollRecord.pay_period),
-            joinedload(PayrollRecord.processed_by_user)
+            joinedload(PayrollRecord.processed_by_user),
+            raiseload('*')
         )
         
         if pay_period_id:
@@ -681,15 +754,15 @@ class PayrollService:
                 "period_end": pay_period.end_date,
                 "pay_date": pay_period.pay_date,
                 "total_records": summary.total_records or 0,
-                "total_gross_pay": summary.total_gross_pay or Decimal('0.00'),
-                "total_net_pay": summary.total_net_pay or Decimal('0.00'),
-                "total_deductions": summary.total_deductions or Decimal('0.00'),
-                "total_federal_tax": summary.total_federal_tax or Decimal('0.00'),
-                "total_state_tax": summary.total_state_tax or Decimal('0.00'),
-                "total_social_security": summary.total_social_security or Decimal('0.00'),
-                "total_medicare": summary.total_medicare or Decimal('0.00'),
-                "total_hours_worked": summary.total_hours_worked or Decimal('0.00'),
-                "total_overtime_hours": summary.total_overtime_hours or Decimal('0.00'),
+                "total_gross_pay": summary.total_gross_pay or _ZERO,
+                "total_net_pay": summary.total_net_pay or _ZERO,
+                "total_deductions": summary.total_deductions or _ZERO,
+                "total_federal_tax": summary.total_federal_tax or _ZERO,
+                "total_state_tax": summary.total_state_tax or _ZERO,
+                "total_social_security": summary.total_social_security or _ZERO,
+                "total_medicare": summary.total_medicare or _ZERO,
+                "total_hours_worked": summary.total_hours_worked or _ZERO,
+                "total_overtime_hours": summary.total_overtime_hours or _ZERO,
                 "status_counts": {status.value: count for status, count in status_counts}
             }
             
@@ -732,8 +805,8 @@ class PayrollService:
             time_entries = self.get_time_entries_for_payroll(employee_id, pay_period_start, pay_period_end)
             
             total_entries = len(time_entries)
-            total_hours = sum(entry.total_hours or Decimal('0.00') for entry in time_entries)
-            total_overtime = sum(entry.overtime_hours or Decimal('0.00') for entry in time_entries)
+            total_hours = sum(entry.total_hours or _ZERO for entry in time_entries)
+            total_overtime = sum(entry.overtime_hours or _ZERO for entry in time_entries)
             
             # Check for missing days (business days only)
             from datetime import timedelta
@@ -8,11 +8,11 @@ clock in/out, break management, overtime calculations, and approval workflow.
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 from typing import List, Optional, Dict, Any, Tuple
-from sqlalchemy import and_, or_, func, desc, asc
+from sqlalchemy import and_, or_, func, desc, asc, update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
-from app.models.time_entry import TimeEntry
+from app.models.time_entry import TimeEntry, minutes_to_hours
 from app.models.employee import Employee
 from app.models.enums import TimeEntryStatus, TimeEntryType, ApprovalStatus, EmployeeStatus
 from app.services.notification_service import NotificationService
@@ -80,8 +80,7 @@ class TimeTrackingService:
         
         # If it's a complete entry, calculate hours automatically
         if time_entry.is_complete:
-            time_entry.calculate_break_duration()
-            time_entry.calculate_hours()
+            time_entry.recalculate_times()
         
         self.db.add(time_entry)
         self.db.commit()
@@ -321,10 +320,7 @@ class TimeTrackingService:
         # Recalculate hours if time fields changed
         if any(field in update_fields for field in ['clock_in_time', 'clock_out_time', 'break_start_time', 'break_end_time', 'lunch_start_time', 'lunch_end_time']):
             if time_entry.is_complete:
-                time_entry.calculate_break_duration()
-                time_entry.calculate_hours()
-        
-        time_entry.updated_at = datetime.utcnow()
+                time_entry.recalculate_times()
         
         self.db.commit()
         self.db.refresh(time_entry)
@@ -363,18 +359,23 @@ class TimeTrackingService:
                 detail="One or more time entries not found"
             )
         
-        updated_entries = []
         for time_entry in time_entries:
-            try:
-                time_entry.submit_for_approval()
-                updated_entries.append(time_entry)
-            except ValueError as e:
+            if not time_entry.is_complete:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Cannot submit time entry {time_entry.id}: {str(e)}"
+                    detail=f"Cannot submit time entry {time_entry.id}: Time entry must be complete before submission"
                 )
         
+        # Same single-UPDATE write as approve_time_entries
+        self.db.execute(
+            update(TimeEntry)
+            .where(TimeEntry.id.in_(time_entry_ids))
+            .values(**TimeEntry.submission_changes())
+            .execution_options(synchronize_session="evaluate")
+        )
+        
         self.db.commit()
+        updated_entries = time_entries
         
         # Send notifications to managers
         self._notify_managers_of_submissions(updated_entries)
@@ -391,16 +392,25 @@ class TimeTrackingService:
                 detail="One or more time entries not found"
             )
         
-        updated_entries = []
-        for time_entry in time_entries:
-            if approval_data.approval_status == ApprovalStatus.APPROVED:
-                time_entry.approve(approver_id, approval_data.notes)
-            elif approval_data.approval_status == ApprovalStatus.REJECTED:
-                time_entry.reject(approver_id, approval_data.rejection_reason)
-            
-            updated_entries.append(time_entry)
+        if approval_data.approval_status == ApprovalStatus.APPROVED:
+            changes = TimeEntry.approval_changes(approver_id, approval_data.notes)
+        elif approval_data.approval_status == ApprovalStatus.REJECTED:
+            changes = TimeEntry.rejection_changes(approver_id, approval_data.rejection_reason)
+        else:
+            changes = None
+        
+        # Every entry gets the same values, so write them with one UPDATE;
+        # the loaded entries are updated in place
+        if changes:
+            self.db.execute(
+                update(TimeEntry)
+                .where(TimeEntry.id.in_(approval_data.time_entry_ids))
+                .values(**changes)
+                .execution_options(synchronize_session="evaluate")
+            )
         
         self.db.commit()
+        updated_entries = time_entries
         
         # Send notifications to employees
         self._notify_employees_of_approval_decision(updated_entries, approver_id, approval_data)
@@ -440,10 +450,10 @@ class TimeTrackingService:
         rejected_entries = query.filter(TimeEntry.approval_status == ApprovalStatus.REJECTED).count()
         
         # Get hour totals
-        hour_totals = query.with_entities(
-            func.sum(TimeEntry.total_hours).label('total_hours'),
-            func.sum(TimeEntry.regular_hours).label('regular_hours'),
-            func.sum(TimeEntry.overtime_hours).label('overtime_hours')
+        minute_totals = query.with_entities(
+            func.coalesce(func.sum(TimeEntry.total_minutes), 0).label('total_minutes'),
+            func.coalesce(func.sum(TimeEntry.regular_minutes), 0).label('regular_minutes'),
+            func.coalesce(func.sum(TimeEntry.overtime_minutes), 0).label('overtime_minutes')
         ).first()
         
         # Get unique employee count
@@ -454,9 +464,9 @@ class TimeTrackingService:
             pending_approval=pending_approval,
             approved_entries=approved_entries,
             rejected_entries=rejected_entries,
-            total_hours=hour_totals.total_hours or Decimal('0.00'),
-            regular_hours=hour_totals.regular_hours or Decimal('0.00'),
-            overtime_hours=hour_totals.overtime_hours or Decimal('0.00'),
+            total_hours=minutes_to_hours(minute_totals.total_minutes),
+            regular_hours=minutes_to_hours(minute_totals.regular_minutes),
+            overtime_hours=minutes_to_hours(minute_totals.overtime_minutes),
             employees_with_entries=employees_with_entries
         )
     
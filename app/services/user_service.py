@@ -7,7 +7,7 @@ authentication, authorization, and user account operations.
 
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 from sqlalchemy.orm import Session
 from sqlalchemy import select, update, delete, func
@@ -136,8 +136,7 @@ class UserService:
                 return None
             
             # Reset failed login attempts and update last login
-            self._reset_failed_login_attempts(user)
-            self._update_last_login(user)
+            self._record_successful_login(user)
             
             logger.info(f"User authenticated successfully: {user.email}")
             return user
@@ -196,7 +195,6 @@ class UserService:
             for field, value in update_data.items():
                 setattr(user, field, value)
             
-            user.updated_at = datetime.utcnow()
             self.db.commit()
             self.db.refresh(user)
             
@@ -234,6 +232,28 @@ class UserService:
             logger.error(f"Error deleting user: {e}")
             return False
     
+    def _apply_user_filters(
+        self,
+        query,
+        role: Optional[UserRole] = None,
+        status: Optional[UserStatus] = None,
+        search: Optional[str] = None
+    ):
+        """Apply the common role/status/search filters to a user query."""
+        if role:
+            query = query.filter(User.role == role)
+        if status:
+            query = query.filter(User.status == status)
+        if search:
+            search_filter = f"%{search}%"
+            query = query.filter(
+                (User.first_name.ilike(search_filter)) |
+                (User.last_name.ilike(search_filter)) |
+                (User.email.ilike(search_filter)) |
+                (User.username.ilike(search_filter))
+            )
+        return query
+    
     def get_users(
         self, 
         skip: int = 0, 
@@ -241,9 +261,12 @@ class UserService:
         role: Optional[UserRole] = None,
         status: Optional[UserStatus] = None,
         search: Optional[str] = None
-    ) -> List[User]:
+    ) -> Tuple[List[User], int]:
         """
-        Get list of users with optional filtering.
+        Get a page of users together with the total match count.
+        
+        The total is computed in the same round-trip as the page using a
+        ``COUNT(*) OVER ()`` window, so callers don't need a separate count query.
         
         Args:
             skip: Number of records to skip
@@ -253,30 +276,24 @@ class UserService:
             search: Search term for name/email
             
         Returns:
-            List of user objects
+            Tuple of (list of user objects, total number of matching users)
         """
         try:
-            query = self.db.query(User)
-            
-            # Apply filters
-            if role:
-                query = query.filter(User.role == role)
-            if status:
-                query = query.filter(User.status == status)
-            if search:
-                search_filter = f"%{search}%"
-                query = query.filter(
-                    (User.first_name.ilike(search_filter)) |
-                    (User.last_name.ilike(search_filter)) |
-                    (User.email.ilike(search_filter)) |
-                    (User.username.ilike(search_filter))
-                )
-            
-            return query.offset(skip).limit(limit).all()
+            query = self.db.query(User, func.count().over().label("total"))
+            query = self._apply_user_filters(query, role=role, status=status, search=search)
+            
+            rows = query.offset(skip).limit(limit).all()
+            if not rows:
+                # An empty page carries no window total; fall back to a count
+                # only when paging past the end of a non-empty result set.
+                total = self.get_user_count(role=role, status=status, search=search) if skip else 0
+                return [], total
+            
+            return [user for user, _ in rows], rows[0].total
             
         except Exception as e:
             logger.error(f"Error getting users: {e}")
-            return []
+            return [], 0
     
     def get_user_count(
         self,
@@ -296,28 +313,41 @@ class UserService:
             Number of users matching criteria
         """
         try:
-            query = self.db.query(User)
-            
-            # Apply filters
-            if role:
-                query = query.filter(User.role == role)
-            if status:
-                query = query.filter(User.status == status)
-            if search:
-                search_filter = f"%{search}%"
-                query = query.filter(
-                    (User.first_name.ilike(search_filter)) |
-                    (User.last_name.ilike(search_filter)) |
-                    (User.email.ilike(search_filter)) |
-                    (User.username.ilike(search_filter))
-                )
-            
+            query = self._apply_user_filters(
+                self.db.query(User), role=role, status=status, search=search
+            )
             return query.count()
             
         except Exception as e:
             logger.error(f"Error getting user count: {e}")
             return 0
     
+    def search_users(self, query: str, limit: int = 100) -> List[User]:
+        """
+        Search users by name, email, or username.
+        
+        Matches against the single lower-cased ``User.search_text`` expression
+        so PostgreSQL can serve the lookup from the ``ix_users_search``
+        trigram index instead of scanning each column separately.
+        
+        Args:
+            query: Search term
+            limit: Maximum number of records to return
+            
+        Returns:
+            List of matching user objects
+        """
+        try:
+            return (
+                self.db.query(User)
+                .filter(User.search_text.contains(query.lower(), autoescape=True))
+                .limit(limit)
+                .all()
+            )
+        except Exception as e:
+            logger.error(f"Error searching users: {e}")
+            return []
+    
     def change_password(self, user_id: int, current_password: str, new_password: str) -> bool:
         """
         Change user password.
@@ -346,7 +376,6 @@ class UserService:
             
             # Hash new password
             user.hashed_password = get_password_hash(new_password)
-            user.updated_at = datetime.utcnow()
             
             self.db.commit()
             logger.info(f"Password changed successfully for user: {user.email}")
@@ -374,7 +403,6 @@ class UserService:
                 return False
             
             user.hashed_password = new_password_hash
-            user.updated_at = datetime.utcnow()
             
             self.db.commit()
             return True
@@ -395,15 +423,17 @@ class UserService:
             True if updated successfully, False otherwise
         """
         try:
-            user = self.get_user_by_id(user_id)
-            if not user:
-                return False
-            
-            user.last_login = datetime.utcnow()
-            user.updated_at = datetime.utcnow()
+            # Single UPDATE by primary key; a loaded instance is updated in place
+            now = datetime.utcnow()
+            result = self.db.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(last_login=now, updated_at=now)
+                .execution_options(synchronize_session="evaluate")
+            )
             
             self.db.commit()
-            return True
+            return result.rowcount > 0
             
         except Exception as e:
             self.db.rollback()
@@ -414,7 +444,6 @@ class UserService:
         """Increment failed login attempts for a user."""
         try:
             user.failed_login_attempts += 1
-            user.updated_at = datetime.utcnow()
             
             # Lock account if too many failed attempts
             if user.failed_login_attempts >= 5:
@@ -427,30 +456,22 @@ class UserService:
             self.db.rollback()
             logger.error(f"Error incrementing failed login attempts: {e}")
     
-    def _reset_failed_login_attempts(self, user: User) -> None:
-        """Reset failed login attempts for a user."""
-        try:
-            user.failed_login_attempts = 0
-            user.locked_until = None
-            user.updated_at = datetime.utcnow()
-            
-            self.db.commit()
-            
-        except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error resetting failed login attempts: {e}")
-    
-    def _update_last_login(self, user: User) -> None:
-        """Update last login timestamp for a user."""
+    def _record_successful_login(self, user: User) -> None:
+        """Reset failed login attempts and update last login in one UPDATE."""
         try:
-            user.last_login = datetime.utcnow()
-            user.updated_at = datetime.utcnow()
+            now = datetime.utcnow()
+            self.db.execute(
+                update(User)
+                .where(User.id == user.id)
+                .values(failed_login_attempts=0, locked_until=None, last_login=now, updated_at=now)
+                .execution_options(synchronize_session="evaluate")
+            )
             
             self.db.commit()
             
         except Exception as e:
             self.db.rollback()
-            logger.error(f"Error updating last login: {e}")
+            logger.error(f"Error recording successful login: {e}")
     
     def create_tokens(self, user: User) -> Dict[str, str]:
         """
@@ -6,14 +6,19 @@ and common test data.
 """
 
 import asyncio
+import os
 import pytest
+from contextlib import contextmanager
 import pytest_asyncio
 from typing import AsyncGenerator, Generator
 from httpx import AsyncClient, ASGITransport
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+# Encrypted columns need a key; set it before settings are first loaded
+os.environ.setdefault("FIELD_ENCRYPTION_KEY", "VGVzdEtleUZvclBheXJvbGxGaWVsZEVuY3J5cHRpb24=")
+
 from app.main import app
 from app.core.database import Base, get_db
 from app.core.config import get_settings
@@ -80,6 +85,25 @@ def test_db_session(test_db_engine) -> Generator[Session, None, None]:
         session.close()
 
 
+@pytest.fixture(scope="function")
+def count_queries(test_db_engine):
+    """Context manager collecting the SQL statements run on the test engine."""
+    @contextmanager
+    def _count_queries():
+        statements = []
+        
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(test_db_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(test_db_engine, "before_cursor_execute", before_cursor_execute)
+    
+    return _count_queries
+
+
 @pytest_asyncio.fixture(scope="function")
 async def test_async_db_session(test_async_db_engine) -> AsyncGenerator[AsyncSession, None]:
     """Create a test async database session."""
@@ -0,0 +1,121 @@
+"""
+Unit tests for the structured logging module.
+
+Tests JSON log formatting and performance metric aggregation.
+"""
+
+import json
+import logging
+import threading
+
+import pytest
+
+from app.core.logging import ContextLoggerAdapter, JSONFormatter, PerformanceMonitor
+
+
+def make_record(**extra) -> logging.LogRecord:
+    """Build a log record the way Logger.makeRecord applies ``extra``."""
+    record = logging.LogRecord(
+        "app.test", logging.INFO, __file__, 1, "hello %s", ("world",), None
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.mark.unit
+class TestJSONFormatter:
+    """Test JSON log formatting."""
+
+    def test_format_basic_fields(self):
+        """Test the always-present fields."""
+        data = json.loads(JSONFormatter().format(make_record()))
+
+        assert data["message"] == "hello world"
+        assert data["level"] == "INFO"
+        assert data["logger"] == "app.test"
+        assert data["service"] == "payroll-api"
+        assert data["timestamp"].endswith("Z")
+
+    def test_format_optional_and_extra_fields(self):
+        """Test request attributes are mapped, None values dropped and the extras dict merged."""
+        record = make_record(
+            correlation_id="abc",
+            method="GET",
+            status_code=200,
+            user_id=None,
+            extras={"event": "request_end"},
+        )
+        data = json.loads(JSONFormatter().format(record))
+
+        assert data["correlation_id"] == "abc"
+        assert data["http_method"] == "GET"
+        assert data["http_status"] == 200
+        assert data["event"] == "request_end"
+        assert "user_id" not in data
+
+    def test_extras_do_not_override_core_fields(self):
+        """Test caller extras cannot replace message, level, logger or timestamp."""
+        record = make_record(extras={
+            "message": "spoofed", "level": "CRITICAL", "logger": "other",
+            "timestamp": "never", "event": "request_end",
+        })
+        data = json.loads(JSONFormatter().format(record))
+
+        assert data["message"] == "hello world"
+        assert data["level"] == "INFO"
+        assert data["logger"] == "app.test"
+        assert data["timestamp"].endswith("Z")
+        assert data["event"] == "request_end"
+
+    def test_adapter_packs_extras(self):
+        """Test ContextLoggerAdapter splits request attributes from extras."""
+        adapter = ContextLoggerAdapter(logging.getLogger("app.test"), {"service_area": "payroll"})
+        _, kwargs = adapter.process("msg", {"extra": {"path": "/x", "event": "request_end"}})
+
+        data = json.loads(JSONFormatter().format(make_record(**kwargs["extra"])))
+        assert data["http_path"] == "/x"
+        assert data["event"] == "request_end"
+        assert data["service_area"] == "payroll"
+
+
+@pytest.mark.unit
+class TestPerformanceMonitor:
+    """Test request metric aggregation."""
+
+    def test_record_request_updates_metrics(self):
+        """Test metrics after a few recorded requests."""
+        monitor = PerformanceMonitor()
+        monitor.record_request(0.010, 200, "/a")
+        monitor.record_request(0.030, 201, "/b")
+        monitor.record_request(0.020, 404, "/c")
+
+        metrics = monitor.get_metrics()
+        assert metrics["requests_total"] == 3
+        assert metrics["requests_by_status"] == {"2xx": 2, "4xx": 1}
+        assert metrics["avg_response_time"] == pytest.approx(20.0)
+        assert metrics["max_response_time"] == pytest.approx(30.0)
+        assert metrics["min_response_time"] == pytest.approx(10.0)
+
+    def test_empty_metrics(self):
+        """Test metrics before any request is recorded."""
+        metrics = PerformanceMonitor().get_metrics()
+        assert metrics["requests_total"] == 0
+        assert metrics["avg_response_time"] == 0
+
+    def test_concurrent_recording(self):
+        """Test that concurrent updates are not lost."""
+        monitor = PerformanceMonitor()
+
+        def worker():
+            for _ in range(1000):
+                monitor.record_request(0.001, 200, "/x")
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        metrics = monitor.get_metrics()
+        assert metrics["requests_total"] == 8000
+        assert metrics["requests_by_status"]["2xx"] == 8000
@@ -0,0 +1,63 @@
+"""
+Unit tests for the security middleware.
+
+Tests path policy lookup and the rate limiter's fixed-window accounting.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.middleware import PathPrefixTrie, RateLimitMiddleware
+
+
+@pytest.mark.unit
+class TestPathPrefixTrie:
+    """Test longest-prefix policy lookup."""
+
+    def test_longest_prefix_wins(self):
+        """Test the deepest matching prefix is returned."""
+        trie = PathPrefixTrie({"/api/": "api", "/api/v1/auth/": "auth"}, "default")
+
+        assert trie.match("/api/v1/auth/login") == "auth"
+        assert trie.match("/api/v1/employees/") == "api"
+        assert trie.match("/docs") == "default"
+        assert trie.match("") == "default"
+
+
+@pytest.mark.unit
+class TestRateLimitMiddleware:
+    """Test fixed-window rate limiting."""
+
+    def test_limit_enforced_within_window(self):
+        """Test requests beyond the path limit are rejected."""
+        limiter = RateLimitMiddleware(None)
+
+        results = [limiter.check_and_record("10.0.0.1", 3)[:2] for _ in range(4)]
+
+        assert results == [(True, 2), (True, 1), (True, 0), (False, 0)]
+        assert limiter._shard("10.0.0.1")["10.0.0.1"][0] == 3
+        assert limiter.check_and_record("10.0.0.2", 3)[0]
+
+    def test_window_resets_after_expiry(self):
+        """Test a new window starts once the previous one has elapsed."""
+        limiter = RateLimitMiddleware(None)
+        for _ in range(3):
+            limiter.check_and_record("10.0.0.1", 3)
+
+        shard = limiter._shard("10.0.0.1")
+        count, window_start = shard["10.0.0.1"]
+        shard["10.0.0.1"] = (count, window_start - limiter.WINDOW_SECONDS)
+
+        assert limiter.check_and_record("10.0.0.1", 3)[0]
+        assert shard["10.0.0.1"][0] == 1
+
+    def test_cleanup_drops_expired_buckets(self):
+        """Test cleanup removes counters from elapsed windows."""
+        limiter = RateLimitMiddleware(None)
+        limiter.check_and_record("10.0.0.1", 60)
+        limiter._shard("10.0.0.2")["10.0.0.2"] = (5, 0.0)
+
+        asyncio.run(limiter.cleanup_old_requests())
+
+        assert [ip for shard in limiter.shards for ip in shard] == ["10.0.0.1"]
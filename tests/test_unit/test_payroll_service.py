@@ -9,6 +9,8 @@ from decimal import Decimal
 from datetime import datetime, date
 from unittest.mock import Mock, patch
 
+from sqlalchemy.exc import InvalidRequestError
+
 from app.services.payroll_service import PayrollService
 from app.models.employee import Employee
 from app.models.payroll import PayrollRecord, PayPeriod
@@ -510,4 +512,108 @@ class TestPayrollErrorHandling:
         pay_period = PayPeriod(id=1, frequency=PayrollFrequency.BI_WEEKLY)
         
         with pytest.raises(Exception):
-            payroll_service.create_payroll_record(employee, pay_period, 80, 0)
\ No newline at end of file
+            payroll_service.create_payroll_record(employee, pay_period, 80, 0)
+
+
+@pytest.mark.unit
+class TestPayrollQueries:
+    """Test loading strategy of payroll list queries."""
+    
+    def test_payroll_records_listed_in_one_query(self, test_db_session, test_utils, count_queries):
+        """Test listed records carry their relations and refuse lazy loads."""
+        employee = test_utils.create_test_employee(
+            test_db_session, hire_date=date(2023, 1, 1), payroll_frequency=PayrollFrequency.MONTHLY
+        )
+        pay_period = PayPeriod(
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 31),
+            pay_date=date(2024, 2, 1),
+            frequency=PayrollFrequency.MONTHLY
+        )
+        test_db_session.add(pay_period)
+        test_db_session.flush()
+        for _ in range(3):
+            test_db_session.add(PayrollRecord(
+                employee_id=employee.id,
+                pay_period_id=pay_period.id,
+                gross_pay=Decimal("1000.00"),
+                net_pay=Decimal("800.00"),
+                total_deductions=Decimal("200.00")
+            ))
+        test_db_session.commit()
+        test_db_session.expire_all()
+        
+        with count_queries() as statements:
+            records = PayrollService(test_db_session).get_payroll_records()
+            assert [record.employee.employee_id for record in records] == ["EMP001"] * 3
+            assert all(record.pay_period.start_date == date(2024, 1, 1) for record in records)
+        
+        assert len(statements) == 1
+        with pytest.raises(InvalidRequestError):
+            records[0].employee.time_entries
+
+
+@pytest.mark.unit
+class TestPayrollBatch:
+    """Test batch payroll processing."""
+    
+    @pytest.fixture
+    def batch_setup(self, test_db_session, test_utils):
+        """Create three monthly employees and an open pay period."""
+        employees = [
+            test_utils.create_test_employee(
+                test_db_session,
+                employee_id=f"EMP00{n}",
+                email=f"employee{n}@company.com",
+                hire_date=date(2023, 1, 1),
+                payroll_frequency=PayrollFrequency.MONTHLY
+            )
+            for n in (1, 2, 3)
+        ]
+        pay_period = PayPeriod(
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 31),
+            pay_date=date(2024, 2, 1),
+            frequency=PayrollFrequency.MONTHLY
+        )
+        test_db_session.add(pay_period)
+        test_db_session.commit()
+        return [employee.id for employee in employees], pay_period
+    
+    def test_batch_writes_every_record(self, test_db_session, batch_setup):
+        """Test a clean batch inserts one record per employee."""
+        employee_ids, pay_period = batch_setup
+        
+        result = PayrollService(test_db_session).process_payroll_batch(pay_period.id, employee_ids)
+        
+        assert result["processed_count"] == 3
+        assert result["error_count"] == 0
+        assert test_db_session.query(PayrollRecord).count() == 3
+        assert result["total_gross_pay"] > 0
+        assert result["total_gross_pay"] == sum(
+            record.gross_pay for record in test_db_session.query(PayrollRecord)
+        )
+    
+    def test_batch_isolates_failing_rows(self, test_db_session, batch_setup):
+        """Test a row the database rejects only fails its own employee."""
+        employee_ids, pay_period = batch_setup
+        service = PayrollService(test_db_session)
+        build_row = service._build_payroll_row
+        
+        def build_row_with_bad_second(**kwargs):
+            row = build_row(**kwargs)
+            if kwargs["employee_id"] == employee_ids[1]:
+                row["net_pay"] = None  # NOT NULL violation on insert
+            return row
+        
+        with patch.object(service, "_build_payroll_row", side_effect=build_row_with_bad_second):
+            result = service.process_payroll_batch(pay_period.id, employee_ids + [999])
+        
+        saved = test_db_session.query(PayrollRecord).all()
+        assert sorted(record.employee_id for record in saved) == [employee_ids[0], employee_ids[2]]
+        assert result["processed_count"] == 2
+        assert result["error_count"] == 2
+        assert [error.split(":")[0] for error in result["errors"]] == [
+            "Employee 999", f"Employee {employee_ids[1]}"
+        ]
+        assert result["total_net_pay"] == sum(record.net_pay for record in saved)
@@ -60,6 +60,16 @@ class TestJWTTokens:
         assert payload["sub"] == subject
         assert payload["type"] == "refresh"
     
+    def test_token_matches_jose_encoding(self):
+        """Test the specialized encoder produces the same token as jose."""
+        from jose import jwt
+        
+        token = create_access_token(subject=123)
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        
+        assert payload["sub"] == "123"
+        assert jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM) == token
+    
     def test_verify_valid_access_token(self):
         """Test verification of valid access token."""
         subject = "test_user_123"
@@ -108,11 +118,22 @@ class TestJWTTokens:
         payload = verify_token(expired_token)
         assert payload is None
     
+    def test_verify_token_uses_cache(self):
+        """Test a verified token is not decoded again."""
+        token = create_access_token(subject="cached_user")
+        assert verify_token(token)["sub"] == "cached_user"
+        
+        with patch('app.core.security._decode_hs_token') as mock_decode:
+            payload = verify_token(token)
+            assert payload["sub"] == "cached_user"
+            assert verify_token(token, token_type="refresh") is None
+            mock_decode.assert_not_called()
+    
     def test_token_without_subject(self):
         """Test token creation and verification edge cases."""
         # This tests the internal validation - normally create_access_token
         # always includes a subject, but we test the verify function's validation
-        with patch('app.core.security.jwt.decode') as mock_decode:
+        with patch('app.core.security._decode_hs_token') as mock_decode:
             mock_decode.return_value = {"exp": datetime.utcnow().timestamp() + 3600, "type": "access"}
             payload = verify_token("dummy_token")
             assert payload is None
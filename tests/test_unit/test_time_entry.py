@@ -0,0 +1,136 @@
+"""
+Unit tests for the TimeEntry model.
+
+Tests the minute-based duration storage, its hour views and the split of
+worked time into regular, overtime and double time.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models.time_entry import TimeEntry, minutes_to_hours
+
+
+@pytest.mark.unit
+class TestMinutesToHours:
+    """Test minute to hour conversion."""
+
+    def test_converts_to_two_places(self):
+        """Test whole minutes become hours with two decimal places."""
+        assert minutes_to_hours(90) == Decimal("1.50")
+        assert minutes_to_hours(20) == Decimal("0.33")
+        assert minutes_to_hours(25) == Decimal("0.42")
+        assert str(minutes_to_hours(0)) == "0.00"
+
+    def test_none_passes_through(self):
+        """Test a missing duration stays missing."""
+        assert minutes_to_hours(None) is None
+
+
+@pytest.mark.unit
+class TestHoursViews:
+    """Test the hour views over the minute columns."""
+
+    def test_get_reads_minutes(self):
+        """Test an hour view reports its minute column in hours."""
+        entry = TimeEntry(total_minutes=450, break_minutes=None)
+        assert entry.total_hours == Decimal("7.50")
+        assert entry.break_duration is None
+
+    def test_set_writes_minutes(self):
+        """Test assigning hours stores whole minutes."""
+        entry = TimeEntry()
+        entry.total_hours = Decimal("7.5")
+        entry.overtime_hours = 1.25
+        entry.lunch_duration = "0.5"
+        entry.break_duration = None
+
+        assert entry.total_minutes == 450
+        assert entry.overtime_minutes == 75
+        assert entry.lunch_minutes == 30
+        assert entry.break_minutes is None
+
+    def test_expression_filters_in_hours(self):
+        """Test an hour view compares in hours inside SQL."""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+
+        with Session(engine) as session:
+            session.add_all([
+                TimeEntry(employee_id=1, work_date=date(2024, 1, 1), total_minutes=480),
+                TimeEntry(employee_id=1, work_date=date(2024, 1, 2), total_minutes=450),
+            ])
+            session.commit()
+
+            ids = session.scalars(select(TimeEntry.id).where(TimeEntry.total_hours > 7.75)).all()
+            assert ids == [1]
+
+
+def make_entry(clock_out: datetime, lunch_minutes: int = 0, break_minutes: int = 0) -> TimeEntry:
+    """Build an 8:00 clock-in entry with an optional lunch and break."""
+    entry = TimeEntry(
+        clock_in_time=datetime(2024, 1, 1, 8),
+        clock_out_time=clock_out,
+    )
+    if lunch_minutes:
+        entry.lunch_start_time = datetime(2024, 1, 1, 12)
+        entry.lunch_end_time = datetime(2024, 1, 1, 12, lunch_minutes)
+    if break_minutes:
+        entry.break_start_time = datetime(2024, 1, 1, 10)
+        entry.break_end_time = datetime(2024, 1, 1, 10, break_minutes)
+    return entry
+
+
+@pytest.mark.unit
+class TestWorkedTimeSplit:
+    """Test worked time and its regular/overtime/double time split."""
+
+    def test_lunch_is_subtracted_once(self):
+        """Test a 30 minute lunch in an 8:00-17:00 day leaves 8.5 worked hours."""
+        entry = make_entry(datetime(2024, 1, 1, 17), lunch_minutes=30)
+        entry.recalculate_times()
+
+        assert entry.lunch_minutes == 30
+        assert entry.break_minutes == 30
+        assert entry.total_hours == Decimal("8.50")
+        assert entry.regular_hours == Decimal("8.00")
+        assert entry.overtime_hours == Decimal("0.50")
+        assert entry.double_time_hours == Decimal("0.00")
+
+    def test_break_and_lunch_are_both_subtracted(self):
+        """Test break and lunch minutes are each taken off worked time."""
+        entry = make_entry(datetime(2024, 1, 1, 17), lunch_minutes=30, break_minutes=15)
+        entry.recalculate_times()
+
+        assert entry.break_minutes == 45
+        assert entry.total_minutes == 495
+        assert entry.regular_minutes == 480
+        assert entry.overtime_minutes == 15
+
+    def test_double_time_after_twelve_hours(self):
+        """Test worked time past 12 hours is double time."""
+        entry = make_entry(datetime(2024, 1, 1, 21, 30), lunch_minutes=30)
+        entry.recalculate_times()
+
+        assert entry.total_hours == Decimal("13.00")
+        assert entry.regular_hours == Decimal("8.00")
+        assert entry.overtime_hours == Decimal("4.00")
+        assert entry.double_time_hours == Decimal("1.00")
+
+    def test_two_pass_calculation_matches(self):
+        """Test calculate_break_duration + calculate_hours agree with recalculate_times."""
+        fused = make_entry(datetime(2024, 1, 1, 17), lunch_minutes=30, break_minutes=15)
+        fused.recalculate_times()
+
+        two_pass = make_entry(datetime(2024, 1, 1, 17), lunch_minutes=30, break_minutes=15)
+        two_pass.calculate_break_duration()
+        two_pass.calculate_hours()
+
+        assert (two_pass.total_minutes, two_pass.regular_minutes, two_pass.overtime_minutes) == (
+            fused.total_minutes, fused.regular_minutes, fused.overtime_minutes
+        )
@@ -0,0 +1,126 @@
+"""
+Unit tests for the custom column types.
+
+Tests integer-cents money storage and its aggregation in SQL, and field
+encryption at rest.
+"""
+
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from cryptography.fernet import Fernet
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, func, insert, select
+
+from app.core.config import settings
+from app.main import app, lifespan
+from app.models.types import EncryptedStr, MoneyCents
+
+
+@pytest.mark.unit
+class TestMoneyCents:
+    """Test money stored as integer cents."""
+
+    def test_bind_converts_to_cents(self):
+        """Test amounts are bound as integer cents."""
+        money = MoneyCents()
+        assert money.process_bind_param(Decimal("52000.00"), None) == 5200000
+        assert money.process_bind_param(12.34, None) == 1234
+        assert money.process_bind_param("0.10", None) == 10
+
+    def test_bind_rounds_half_up(self):
+        """Test sub-cent amounts round half away from zero."""
+        money = MoneyCents()
+        assert money.process_bind_param(Decimal("0.005"), None) == 1
+        assert money.process_bind_param(Decimal("0.004"), None) == 0
+        assert money.process_bind_param(Decimal("-0.005"), None) == -1
+        assert money.process_bind_param(Decimal("-12.345"), None) == -1235
+
+    def test_result_converts_to_currency(self):
+        """Test stored cents load as two-place Decimals."""
+        money = MoneyCents()
+        assert money.process_result_value(5200000, None) == Decimal("52000.00")
+        assert money.process_result_value(-1, None) == Decimal("-0.01")
+        assert str(money.process_result_value(1234, None)) == "12.34"
+
+    def test_none_passes_through(self):
+        """Test NULL is neither bound nor loaded as a number."""
+        money = MoneyCents()
+        assert money.process_bind_param(None, None) is None
+        assert money.process_result_value(None, None) is None
+
+    def test_sum_returns_currency_units(self):
+        """Test SUM() over a money column comes back in currency units."""
+        metadata = MetaData()
+        amounts = Table(
+            "amounts", metadata,
+            Column("id", Integer, primary_key=True),
+            Column("amount", MoneyCents),
+        )
+        engine = create_engine("sqlite://")
+        metadata.create_all(engine)
+
+        with engine.begin() as conn:
+            conn.execute(insert(amounts), [
+                {"amount": Decimal("1000.10")},
+                {"amount": Decimal("0.005")},
+                {"amount": Decimal("-250.00")},
+            ])
+            assert conn.scalar(select(amounts.c.amount).where(amounts.c.id == 1)) == Decimal("1000.10")
+            assert conn.scalar(select(func.sum(amounts.c.amount))) == Decimal("750.11")
+
+
+@pytest.mark.unit
+class TestEncryptedStr:
+    """Test string columns encrypted with Fernet."""
+
+    @pytest.fixture
+    def fresh_cipher(self, monkeypatch):
+        """Rebuild the process-wide cipher from a new key for each test."""
+        monkeypatch.setattr(settings, "FIELD_ENCRYPTION_KEY", Fernet.generate_key().decode())
+        monkeypatch.setattr(EncryptedStr, "_cipher", None)
+
+    def test_round_trip(self, fresh_cipher):
+        """Test a value is stored as a Fernet token and loads back unchanged."""
+        column = EncryptedStr(255)
+        token = column.process_bind_param("123-45-6789", None)
+
+        assert token != "123-45-6789"
+        assert token.startswith("gAAAAA")
+        assert column.process_result_value(token, None) == "123-45-6789"
+
+    def test_empty_and_none(self, fresh_cipher):
+        """Test empty values are stored as NULL and NULL loads as None."""
+        column = EncryptedStr(255)
+        assert column.process_bind_param("", None) is None
+        assert column.process_bind_param(None, None) is None
+        assert column.process_result_value(None, None) is None
+
+    def test_legacy_plaintext_passes_through(self, fresh_cipher):
+        """Test values stored before encryption load as they are."""
+        column = EncryptedStr(255)
+        assert column.process_result_value("123-45-6789", None) == "123-45-6789"
+        assert column.process_result_value("021000021", None) == "021000021"
+
+    def test_missing_key_raises(self, monkeypatch):
+        """Test the cipher refuses to fall back to a derived key."""
+        monkeypatch.setattr(settings, "FIELD_ENCRYPTION_KEY", None)
+        monkeypatch.setattr(EncryptedStr, "_cipher", None)
+
+        with pytest.raises(RuntimeError, match="FIELD_ENCRYPTION_KEY"):
+            EncryptedStr.cipher()
+
+    def test_startup_fails_without_key(self, monkeypatch):
+        """Test the application lifespan stops before touching the database."""
+        monkeypatch.setattr(settings, "FIELD_ENCRYPTION_KEY", None)
+        monkeypatch.setattr(EncryptedStr, "_cipher", None)
+
+        async def start():
+            async with lifespan(app):
+                pass
+
+        with patch("app.main.init_db", new_callable=AsyncMock) as init_db:
+            with pytest.raises(RuntimeError, match="FIELD_ENCRYPTION_KEY"):
+                asyncio.run(start())
+            init_db.assert_not_called()